@@ -2,10 +2,14 @@
 """Add URLs from a .txt file into url_batches/all_links.txt with deduplication."""
 
 import argparse
+import re
 from pathlib import Path
 
 import url_manager
 
+# Lone surrogates produced by errors="surrogateescape" for undecodable bytes
+ESCAPED_BYTE_RE = re.compile("[\udc80-\udcff]")
+
 
 def main() -> int:
     parser = argparse.ArgumentParser(description="Append new URLs from a text file to the master URL list.")
@@ -17,8 +21,21 @@ def main() -> int:
         print(f"[ERROR] File not found: {source_file}")
         return 1
 
-    content = source_file.read_text(encoding="utf-8", errors="ignore")
+    raw = source_file.read_bytes()
+    # URL lists are almost always pure ASCII: skip the UTF-8 decoder for those
+    is_ascii = raw.isascii()
+    if is_ascii:
+        content = raw.decode("ascii")
+    else:
+        # Keep invalid bytes as lone surrogates rather than silently dropping them
+        content = raw.decode("utf-8", errors="surrogateescape")
     parsed_urls = url_manager.parse_urls_from_text(content)
+    if not is_ascii:
+        # URLs carrying invalid bytes cannot be written back as UTF-8
+        invalid = [url for url in parsed_urls if ESCAPED_BYTE_RE.search(url)]
+        if invalid:
+            print(f"[WARN] Skipping {len(invalid)} URLs with invalid UTF-8 bytes, e.g. {invalid[0]!r}")
+            parsed_urls = [url for url in parsed_urls if not ESCAPED_BYTE_RE.search(url)]
     if not parsed_urls:
         print("[INFO] No valid URLs found in input file.")
         return 0
@@ -1,11 +1,39 @@
 """Streamlit Admin UI for Auto News Intelligence Pipeline"""
 import streamlit as st
-import json
+import io
+import queue
+import re
 import shutil
+import threading
+import time
+from collections import deque
 from pathlib import Path
 from datetime import datetime
 from dotenv import load_dotenv
 import os
+import pandas as pd
+import orjson
+
+# URL line prefixes counted in the master file
+_HTTP_PREFIXES = (b'http://', b'https://')
+
+# Max rows shown in the upload preview table
+PREVIEW_ROWS = 500
+
+# Progress reached when a stage tag first appears in the pipeline log
+STAGE_PROGRESS = {
+    '[DOWNLOAD]': 0.2,
+    '[LOAD]': 0.3,
+    '[FILTER]': 0.4,
+    '[EMBED]': 0.5,
+    '[CLASSIFY]': 0.6,
+    '[DEDUP]': 0.8,
+    '[DONE]': 1.0
+}
+_STAGE_RE = re.compile('|'.join(re.escape(stage) for stage in STAGE_PROGRESS))
+
+# Number of trailing log lines shown while the pipeline runs
+LOG_TAIL_LINES = 30
 
 # Import our modules
 import url_manager
@@ -13,6 +41,54 @@ import pipeline_runner
 
 load_dotenv()
 
+
+@st.cache_data(ttl=60)
+def _load_config() -> dict:
+    """Read pipeline settings from the environment (refreshed at most once a minute)."""
+    return {
+        "Similarity Threshold": os.getenv('SIMILARITY_THRESHOLD', '0.85'),
+        "Auto Filter Threshold": os.getenv('AUTO_FILTER_THRESHOLD', '0.40'),
+        "Min Category Confidence": os.getenv('MIN_CATEGORY_CONFIDENCE', '0.20'),
+        "Input Folder": os.getenv('INPUT_FOLDER', 'input/articles/articles'),
+    }
+
+
+@st.cache_data(show_spinner=False)
+def _count_master_urls(path: str, mtime_ns: int) -> int:
+    """Count URL lines in the master file; mtime_ns keys the cache to file changes."""
+    data = Path(path).read_bytes()
+    # Count line starts with bytes.count (C-level search) instead of iterating lines
+    return sum(data.count(b'\n' + prefix) + data.startswith(prefix) for prefix in _HTTP_PREFIXES)
+
+
+@st.cache_data(show_spinner=False)
+def _load_results(path: str, mtime_ns: int, size: int) -> dict:
+    """Parse results.json; mtime_ns and size key the cache so a rewritten file is reloaded."""
+    raw = Path(path).read_bytes()
+    return orjson.loads(raw)
+
+
+# Marks the end of the pipeline log stream in the UI's line queue
+_STREAM_END = object()
+
+
+def _pump_lines(lines, out: queue.Queue):
+    """Move lines from a (blocking) generator into a queue, then _STREAM_END.
+    An exception raised by the generator is queued for the UI thread to re-raise."""
+    try:
+        for line in lines:
+            out.put(line)
+    except Exception as e:
+        out.put(e)
+    finally:
+        out.put(_STREAM_END)
+
+
+def _dump_results(data: dict) -> bytes:
+    """Serialize results as indented JSON bytes."""
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+
+
 st.set_page_config(
     page_title="Auto News Pipeline Admin",
     page_icon="🚗",
@@ -27,12 +103,7 @@ with st.sidebar:
     st.header("⚙️ Current Configuration")
     st.caption("Loaded from .env file")
     
-    config_items = {
-        "Similarity Threshold": os.getenv('SIMILARITY_THRESHOLD', '0.85'),
-        "Auto Filter Threshold": os.getenv('AUTO_FILTER_THRESHOLD', '0.40'),
-        "Min Category Confidence": os.getenv('MIN_CATEGORY_CONFIDENCE', '0.20'),
-        "Input Folder": os.getenv('INPUT_FOLDER', 'input/articles/articles'),
-    }
+    config_items = _load_config()
     
     for key, value in config_items.items():
         st.text(f"{key}: {value}")
@@ -48,26 +119,32 @@ uploaded_file = st.file_uploader(
 
 if uploaded_file is not None:
     # Parse URLs
-    content = uploaded_file.read().decode('utf-8')
-    new_urls = url_manager.parse_urls_from_text(content)
-    
+    text_stream = io.TextIOWrapper(uploaded_file, encoding='utf-8', errors='ignore')
+    new_urls = url_manager.parse_urls_from_lines(text_stream)
+    text_stream.detach()  # keep the upload buffer open for Streamlit
+    # Drop repeated URLs within the upload, keeping first-seen order
+    new_urls = list(dict.fromkeys(new_urls))
+
     if new_urls:
         # Check against existing
         existing_urls = url_manager.load_master_urls()
         
-        # Build preview table
-        preview_data = []
-        new_count = 0
-        existing_count = 0
+        # Classify with set algebra (new_urls is already de-duplicated)
+        dup_set = set(new_urls) & existing_urls
+        existing_count = len(dup_set)
+        new_count = len(new_urls) - existing_count
         
-        for url in new_urls:
-            if url in existing_urls:
-                status = "Already exists"
-                existing_count += 1
-            else:
-                status = "New"
-                new_count += 1
-            preview_data.append({"URL": url[:80] + "..." if len(url) > 80 else url, "Status": status})
+        # Build preview table for the first PREVIEW_ROWS URLs only
+        preview_data = [
+            {
+                "URL": url[:80] + "..." if len(url) > 80 else url,
+                "Status": "Already exists" if url in dup_set else "New",
+            }
+            for url in new_urls[:PREVIEW_ROWS]
+        ]
+        
+        if len(new_urls) > PREVIEW_ROWS:
+            preview_data.append({"URL": f"... and {len(new_urls) - PREVIEW_ROWS} more", "Status": ""})
         
         st.info(f"📊 Found {len(new_urls)} URLs: **{new_count} new**, {existing_count} already in master")
         
@@ -95,15 +172,15 @@ col1, col2, col3 = st.columns(3)
 
 master_file = Path('url_batches/all_links.txt')
 if master_file.exists():
-    with open(master_file, 'r') as f:
-        total_urls = len([line for line in f if line.strip().startswith('http')])
+    total_urls = _count_master_urls(str(master_file), master_file.stat().st_mtime_ns)
     col1.metric("Total URLs in master", total_urls)
 else:
     col1.metric("Total URLs in master", 0)
 
 html_dir = Path('input/articles/articles')
 if html_dir.exists():
-    html_count = len(list(html_dir.glob('*.html')))
+    with os.scandir(html_dir) as entries:
+        html_count = sum(1 for entry in entries if entry.name.endswith('.html'))
     col2.metric("HTML files downloaded", html_count)
 else:
     col2.metric("HTML files downloaded", 0)
@@ -111,11 +188,11 @@ else:
 results_file = Path('output/results.json')
 if results_file.exists():
     try:
-        with open(results_file, 'r') as f:
-            data = json.load(f)
-            last_run = data.get('run_at', 'Unknown')
-            if last_run != 'Unknown':
-                last_run = datetime.fromisoformat(last_run).strftime('%Y-%m-%d %H:%M')
+        results_stat = results_file.stat()
+        data = _load_results(str(results_file), results_stat.st_mtime_ns, results_stat.st_size)
+        last_run = data.get('run_at', 'Unknown')
+        if last_run != 'Unknown':
+            last_run = datetime.fromisoformat(last_run).strftime('%Y-%m-%d %H:%M')
         col3.metric("Last run", last_run)
     except:
         col3.metric("Last run", "Unknown")
@@ -134,38 +211,58 @@ if st.button("▶ Run Full Pipeline", type="primary", use_container_width=False)
     
     # Log stream
     log_container = st.empty()
-    log_lines = []
+    log_lines = deque(maxlen=LOG_TAIL_LINES)
+    lines_since_flush = 0
+    last_flush = time.monotonic()
     
-    # Run pipeline
-    stage_progress = {
-        '[DOWNLOAD]': 0.2,
-        '[LOAD]': 0.3,
-        '[FILTER]': 0.4,
-        '[EMBED]': 0.5,
-        '[CLASSIFY]': 0.6,
-        '[DEDUP]': 0.8,
-        '[DONE]': 1.0
-    }
+    # Read the pipeline stream on a helper thread so the UI can redraw while it waits
+    # for output (the runner is silent for long stretches, e.g. while embedding)
+    log_queue = queue.Queue()
+    threading.Thread(target=_pump_lines, args=(pipeline_runner.stream_pipeline(), log_queue), daemon=True).start()
     
+    # Run pipeline
     current_progress = 0.0
     
-    for log_line in pipeline_runner.stream_pipeline():
+    while True:
+        # Wait for the next line, but no longer than the 0.25s redraw window while
+        # undrawn lines are pending; if the stream stays quiet, show them before blocking
+        try:
+            if lines_since_flush:
+                log_line = log_queue.get(timeout=max(0.0, 0.25 - (time.monotonic() - last_flush)))
+            else:
+                log_line = log_queue.get()
+        except queue.Empty:
+            log_container.code(''.join(log_lines), language='log')
+            lines_since_flush = 0
+            last_flush = time.monotonic()
+            log_line = log_queue.get()
+        
+        if log_line is _STREAM_END:
+            break
+        if isinstance(log_line, BaseException):
+            raise log_line
+        
         log_lines.append(log_line)
+        lines_since_flush += 1
         
         # Update progress based on stage
-        for stage, prog in stage_progress.items():
-            if stage in log_line and prog > current_progress:
+        match = _STAGE_RE.search(log_line)
+        if match:
+            stage = match.group(0)
+            prog = STAGE_PROGRESS[stage]
+            if prog > current_progress:
                 current_progress = prog
                 progress_bar.progress(current_progress)
                 progress_text.text(f"Stage: {stage}")
-                break
         
-        # Show last 30 lines
-        display_lines = log_lines[-30:]
-        log_container.code(''.join(display_lines), language='log')
+        # Redraw the last 30 lines on a stage line, or once 10 lines or 0.25s have
+        # accumulated since the last redraw, whichever comes first
+        if match or lines_since_flush >= 10 or time.monotonic() - last_flush > 0.25:
+            log_container.code(''.join(log_lines), language='log')
+            lines_since_flush = 0
+            last_flush = time.monotonic()
     
-    # Get final stats
-    stats = pipeline_runner.stream_pipeline.__code__.co_consts
+    log_container.code(''.join(log_lines), language='log')
     
     progress_bar.progress(1.0)
     progress_text.text("✓ Complete")
@@ -177,7 +274,7 @@ if st.button("▶ Run Full Pipeline", type="primary", use_container_width=False)
     if streamlit_app_dir.exists():
         try:
             dest = streamlit_app_dir / 'results.json'
-            shutil.copy(results_file, dest)
+            shutil.copyfile(results_file, dest)
             st.success(f"📋 Auto-published results to {dest}")
         except Exception as e:
             st.warning(f"Pipeline finished but auto-publish failed: {e}")
@@ -192,8 +289,8 @@ st.header("📊 Section 3: Output & Export")
 
 if results_file.exists():
     try:
-        with open(results_file, 'r') as f:
-            data = json.load(f)
+        results_stat = results_file.stat()
+        data = _load_results(str(results_file), results_stat.st_mtime_ns, results_stat.st_size)
         
         # Summary metrics
         st.subheader("Summary Metrics")
@@ -203,33 +300,35 @@ if results_file.exists():
         col2.metric("Auto-relevant", data['stats']['total_automobile'])
         col3.metric("Categories", len(data['categories']))
         
-        total_stories = sum(cat['unique_stories'] for cat in data['categories'].values())
+        # One pass over categories feeds both the story total and the breakdown table
+        total_stories = 0
+        cat_rows = {}
+        for cat_name, cat_data in data['categories'].items():
+            total_stories += cat_data['unique_stories']
+            cat_rows[cat_name] = {"Articles": cat_data['total_articles'], "Unique Stories": cat_data['unique_stories']}
+        
         col4.metric("Unique Stories", total_stories)
         col5.metric("Sources", data['stats']['unique_sources'])
         
         # Category breakdown
         st.subheader("Category Breakdown")
         
-        cat_table = []
-        for cat_name, cat_data in data['categories'].items():
-            cat_table.append({
-                "Category": cat_name,
-                "Articles": cat_data['total_articles'],
-                "Unique Stories": cat_data['unique_stories']
-            })
+        cat_table = pd.DataFrame.from_dict(cat_rows, orient='index').rename_axis('Category').reset_index()
         
         st.dataframe(cat_table, width='stretch')
         
+        # Serialize once for both the preview and the download button
+        json_bytes = _dump_results(data)
+        json_str = json_bytes.decode('utf-8')
+        
         # Preview results.json
         with st.expander("🔍 Preview results.json (first 50 lines)"):
-            json_str = json.dumps(data, indent=2)
-            lines = json_str.split('\n')[:50]
+            lines = json_str.split('\n', 50)[:50]
             st.code('\n'.join(lines), language='json')
         
         st.markdown("")
         
         # Download button
-        json_bytes = json.dumps(data, indent=2).encode('utf-8')
         st.download_button(
             label="⬇ Download results.json",
             data=json_bytes,
@@ -245,7 +344,7 @@ if results_file.exists():
             if st.button("📋 Copy to streamlit-app/", type="secondary"):
                 try:
                     dest = streamlit_app_dir / 'results.json'
-                    shutil.copy(results_file, dest)
+                    shutil.copyfile(results_file, dest)
                     st.success(f"✓ Copied to {dest}")
                     
                     # Show git instructions
@@ -1,10 +1,13 @@
 import streamlit as st
-import json
 import plotly.graph_objects as go
 import plotly.express as px
 from pathlib import Path
 import pandas as pd
+import numpy as np
 from datetime import datetime
+from collections import Counter
+from itertools import chain, islice
+import orjson
 
 st.set_page_config(page_title="News Dashboard", page_icon="🚗", layout="wide")
 
@@ -21,98 +24,209 @@ CATEGORY_COLORS = {
 }
 
 CATEGORY_NAMES = list(CATEGORY_COLORS.keys())
+CAT_IDX = {name: i for i, name in enumerate(CATEGORY_NAMES)}
 
+RESULTS_PATH = Path('output/results.json')
 
-@st.cache_data
-def load_data():
-    """Load results.json."""
-    results_path = Path('output/results.json')
-    if not results_path.exists():
-        return None
-    with open(results_path, 'r') as f:
-        return json.load(f)
+ARTICLE_COLUMNS = ['title', 'category', 'source', 'story_idx', 'published_at', 'url',
+                   'story_count', 'summary', 'is_representative', 'auto_score']
+
+# Page styles, built once at import. Full reruns re-emit this block (Streamlit
+# drops elements a rerun doesn't re-send), but widget interactions only rerun
+# their fragment and leave it in place.
+DASHBOARD_CSS = """
+<style>
+.metric-card {
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    padding: 20px;
+    border-radius: 10px;
+    color: white;
+    text-align: center;
+    box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+}
+.metric-value {
+    font-size: 2.5rem;
+    font-weight: bold;
+    margin: 10px 0;
+}
+.metric-label {
+    font-size: 0.9rem;
+    opacity: 0.9;
+}
+.news-card {
+    border: 1px solid #e0e0e0;
+    border-radius: 8px;
+    padding: 15px;
+    margin: 10px 0;
+    background: white;
+    box-shadow: 0 2px 4px rgba(0,0,0,0.05);
+    transition: transform 0.2s;
+}
+.news-card:hover {
+    transform: translateY(-2px);
+    box-shadow: 0 4px 8px rgba(0,0,0,0.1);
+}
+.news-title {
+    font-size: 1.1rem;
+    font-weight: 600;
+    color: #1a1a1a;
+    margin-bottom: 8px;
+}
+.news-meta {
+    font-size: 0.85rem;
+    color: #666;
+}
+.scrolling-text {
+    background: #f8f9fa;
+    padding: 10px;
+    border-radius: 5px;
+    overflow: hidden;
+    white-space: nowrap;
+}
+.ticker {
+    display: inline-block;
+    padding-left: 100%;
+    animation: ticker-scroll 60s linear infinite;
+    will-change: transform;
+}
+@keyframes ticker-scroll {
+    from { transform: translateX(0); }
+    to { transform: translateX(-100%); }
+}
+</style>
+"""
+
+
+@st.cache_data(max_entries=4, persist="disk", show_spinner=False)
+def load_data(mtime: float):
+    """Load results.json. mtime is the file's modification time and keys the cache."""
+    raw = RESULTS_PATH.read_bytes()
+    return orjson.loads(raw)
+
+
+@st.cache_data(show_spinner=False)
+def build_article_frame(mtime: float, _data: dict) -> pd.DataFrame:
+    """Flatten categories → stories → articles into one row per article.
+
+    _data is not hashed by Streamlit; mtime (the results.json version) keys the cache.
+    """
+    records = [
+        {
+            'title': article['title'],
+            'category': cat_name,
+            'source': article['source'],
+            'story_idx': story_idx,
+            'published_at': article.get('published_at', ''),
+            'url': article.get('url', None),
+            'story_count': story['story_count'],
+            'summary': story['summary'],
+            'is_representative': article.get('is_representative', False),
+            'auto_score': article.get('auto_score', 0),
+        }
+        for cat_name, cat_data in _data['categories'].items()
+        for story_idx, story in enumerate(cat_data['stories'])
+        for article in story['articles']
+    ]
+    df = pd.DataFrame.from_records(records, columns=ARTICLE_COLUMNS)
+    # Parse all dates in one vectorized pass; the date is the leading YYYY-MM-DD
+    # of both ISO timestamps and plain dates, unparseable values become NaT
+    df['pub_date'] = pd.to_datetime(
+        df['published_at'].str[:10], format='%Y-%m-%d', errors='coerce'
+    )
+    return df
 
 
-def create_scatter_plot(data, selected_categories):
+@st.cache_data(show_spinner=False)
+def layout_positions(category: str, n: int) -> np.ndarray:
+    """Deterministic (x, y) bubble positions for a category's n stories.
+
+    Each category gets its own seeded generator and a cell in a 3-column grid,
+    so positions don't shift when other categories are toggled.
+    """
+    cat_idx = CAT_IDX[category]
+    rng = np.random.default_rng(42 + cat_idx)
+    offset = np.array([(cat_idx % 3) * 30, (cat_idx // 3) * 30])
+    return rng.uniform(-10, 10, size=(n, 2)) + offset
+
+
+@st.cache_data(show_spinner=False)
+def build_story_frame(mtime: float, _data: dict) -> pd.DataFrame:
+    """One row per story with its bubble size and prebuilt hover HTML.
+
+    _data is not hashed by Streamlit; mtime (the results.json version) keys the cache.
+    """
+    records = [
+        {
+            'category': cat_name,
+            'title': story['representative_title'],
+            'story_count': story['story_count'],
+            'sources': story['sources'],
+            'summary': story['summary'],
+        }
+        for cat_name, cat_data in _data['categories'].items()
+        for story in cat_data['stories']
+    ]
+    df = pd.DataFrame.from_records(records, columns=['category', 'title', 'story_count', 'sources', 'summary'])
+    
+    # Size based on story count
+    df['marker_size'] = np.minimum(15 + df['story_count'] * 8, 60)
+    
+    # Build hover text with vectorized string ops instead of an f-string per point
+    n_sources = df['sources'].str.len()
+    more = np.where(n_sources > 4, ' +' + (n_sources - 4).astype(str) + ' more', '')
+    df['hover_html'] = (
+        '<b>' + df['title'].str[:70] + '</b><br>'
+        + '<b>Category:</b> ' + df['category'] + '<br>'
+        + '<b>Sources (' + df['story_count'].astype(str) + '):</b> '
+        + df['sources'].str[:4].str.join(', ') + more + '<br>'
+        + '<b>Summary:</b> ' + df['summary'].str[:150] + '...'
+    )
+    return df
+
+
+@st.cache_data(show_spinner=False)
+def build_headlines(mtime: float, _data: dict) -> str:
+    """Ticker text: the first 15 of each category's top 3 story titles.
+
+    _data is not hashed by Streamlit; mtime (the results.json version) keys the cache.
+    """
+    headlines = (
+        f"• {story['representative_title']}"
+        for cat_data in _data['categories'].values()
+        for story in cat_data['stories'][:3]  # Top 3 from each category
+    )
+    return " • ".join(islice(headlines, 15))
+
+
+def create_scatter_plot(stories_df, selected_categories):
     """Create scatter plot with stories as bubbles, colored by category."""
     fig = go.Figure()
     
-    # Collect all stories across categories
-    all_stories = []
-    for category in CATEGORY_NAMES:
-        if category not in selected_categories or category not in data['categories']:
-            continue
-        
-        cat_data = data['categories'][category]
-        for story in cat_data['stories']:
-            all_stories.append({
-                'category': category,
-                'title': story['representative_title'],
-                'story_count': story['story_count'],
-                'sources': story['sources'],
-                'summary': story['summary'],
-                'articles_count': len(story['articles'])
-            })
-    
-    if not all_stories:
-        return fig
-    
-    # Create scatter plot - one trace per category for legend
-    import random
-    random.seed(42)
+    # Split the cached story frame by category once
+    stories_by_cat = dict(tuple(stories_df.groupby('category', sort=False)))
     
+    # Create scatter plot - one WebGL trace per category, so legend clicks still filter
     for category in CATEGORY_NAMES:
-        if category not in selected_categories:
-            continue
-        
-        # Filter stories for this category
-        cat_stories = [s for s in all_stories if s['category'] == category]
-        
-        if not cat_stories:
+        if category not in selected_categories or category not in stories_by_cat:
             continue
         
-        x_positions = []
-        y_positions = []
-        sizes = []
-        hovers = []
+        cat_stories = stories_by_cat[category]
+        positions = layout_positions(category, len(cat_stories))
         
-        for i, story in enumerate(cat_stories):
-            # Random position with some clustering by category
-            cat_idx = CATEGORY_NAMES.index(category)
-            base_x = (cat_idx % 3) * 30 + random.uniform(-10, 10)
-            base_y = (cat_idx // 3) * 30 + random.uniform(-10, 10)
-            
-            x_positions.append(base_x)
-            y_positions.append(base_y)
-            
-            # Size based on story count
-            sizes.append(min(15 + story['story_count'] * 8, 60))
-            
-            sources_list = ', '.join(story['sources'][:4])
-            if len(story['sources']) > 4:
-                sources_list += f" +{len(story['sources']) - 4} more"
-            
-            hovers.append(
-                f"<b>{story['title'][:70]}</b><br>"
-                f"<b>Category:</b> {category}<br>"
-                f"<b>Sources ({story['story_count']}):</b> {sources_list}<br>"
-                f"<b>Summary:</b> {story['summary'][:150]}..."
-            )
-        
-        # Add trace for this category
-        fig.add_trace(go.Scatter(
-            x=x_positions,
-            y=y_positions,
+        # Add trace for this category (WebGL renderer instead of SVG markers)
+        fig.add_trace(go.Scattergl(
+            x=positions[:, 0],
+            y=positions[:, 1],
             mode='markers',
             marker=dict(
-                size=sizes,
+                size=cat_stories['marker_size'].values,
                 color=CATEGORY_COLORS[category],
                 line=dict(width=1, color='white'),
                 opacity=0.7
             ),
             name=category,
             hovertemplate='%{hovertext}<extra></extra>',
-            hovertext=hovers,
+            hovertext=cat_stories['hover_html'].values,
             showlegend=True
         ))
     
@@ -155,71 +269,202 @@ def create_scatter_plot(data, selected_categories):
     return fig
 
 
+@st.fragment
+def render_grid(articles_df: pd.DataFrame):
+    """Date/category filters and the news grid; reruns on its own when a filter changes."""
+    st.markdown("### Filters")
+    filter_col1, filter_col2 = st.columns(2)
+    
+    with filter_col1:
+        # Date picker
+        min_date = datetime(2018, 1, 1).date()
+        max_date = datetime.now().date()
+        selected_date_range = st.date_input(
+            "Select Date Range",
+            value=(min_date, max_date),
+            min_value=min_date,
+            max_value=max_date,
+            key="date_filter"
+        )
+    
+    with filter_col2:
+        # Category filter for grid
+        grid_category_filter = st.selectbox(
+            "Filter by Category",
+            options=["All Categories"] + CATEGORY_NAMES,
+            key="grid_category_filter"
+        )
+    
+    # Recent News Grid (2 rows x 4 columns)
+    st.markdown("### Recent News Grid")
+    
+    # Get stories filtered by date and category with vectorized masks
+    grid_df = articles_df
+    if grid_category_filter != "All Categories":
+        grid_df = grid_df[grid_df['category'] == grid_category_filter]
+    
+    # Articles without a published date are not shown; unparseable dates are
+    # included anyway, parsed dates must fall in the range
+    if len(selected_date_range) == 2:
+        in_range = grid_df['pub_date'].between(
+            pd.Timestamp(selected_date_range[0]), pd.Timestamp(selected_date_range[1])
+        )
+    else:
+        in_range = False
+    has_date = grid_df['published_at'].fillna('') != ''
+    grid_df = grid_df[has_date & (grid_df['pub_date'].isna() | in_range)]
+    
+    # Most recent first (undated last) and take top 8
+    top_stories = (
+        grid_df.sort_values('pub_date', ascending=False, na_position='last', kind='stable')
+        .head(8)
+        .to_dict('records')
+    )
+    
+    # Display in 2 rows of 4: one CSS grid emitted with a single markdown call
+    cards = []
+    for story in top_stories:
+        title_display = story['title'][:60] + "..." if len(story['title']) > 60 else story['title']
+        
+        # Create clickable link if URL exists
+        if story['url']:
+            title_display = f'<a href="{story["url"]}" target="_blank" style="text-decoration: none; color: #1a1a1a;">{title_display}</a>'
+        
+        cards.append(
+            f'<div class="news-card">'
+            f'<div class="news-title">{title_display}</div>'
+            f'<div class="news-meta">'
+            f'<span style="color: {CATEGORY_COLORS[story["category"]]};">●</span> {story["category"]}<br>'
+            f'{story["source"]}'
+            f'</div>'
+            f'</div>'
+        )
+    
+    if cards:
+        st.markdown(
+            '<div style="display: grid; grid-template-columns: repeat(4, 1fr); gap: 1rem;">'
+            + '\n'.join(cards) + '</div>',
+            unsafe_allow_html=True
+        )
+
+
+@st.fragment
+def render_scatter(stories_df: pd.DataFrame, present_cats: list):
+    """Scatter plot with its category filter; reruns on its own when the filter changes."""
+    st.markdown("###  Story Scatter Plot Visualization")
+    st.caption("Each bubble represents a unique story. Size = number of sources. Click legend to filter categories.")
+    
+    # Category filter for scatter plot
+    scatter_categories = st.multiselect(
+        "Select categories to display:",
+        options=CATEGORY_NAMES,
+        default=present_cats,
+        key="scatter_filter"
+    )
+    
+    if scatter_categories:
+        fig_scatter = create_scatter_plot(stories_df, scatter_categories)
+        
+        config = {
+            'scrollZoom': True,
+            'displayModeBar': True,
+            'modeBarButtonsToRemove': ['select2d', 'lasso2d'],
+            'toImageButtonOptions': {'format': 'png', 'filename': 'auto_news_scatter'}
+        }
+        
+        st.plotly_chart(fig_scatter, use_container_width=True, config=config)
+
+
+@st.fragment
+def render_details(data: dict, present_cats: list):
+    """Per-category story details; reruns on its own when the category changes."""
+    st.markdown("###  Detailed Stories by Category")
+    
+    # Category selector
+    selected_cat = st.selectbox("Select Category", options=present_cats)
+    
+    if selected_cat and selected_cat in data['categories']:
+        cat_data = data['categories'][selected_cat]
+        
+        st.markdown(f"**{cat_data['total_articles']} articles • {cat_data['unique_stories']} unique stories**")
+        
+        # Show ALL stories (not just top 10)
+        for idx, story in enumerate(cat_data['stories'], 1):
+            with st.expander(f" Story #{idx}: {story['representative_title']} ({story['story_count']} sources)", expanded=False):
+                # Summary
+                st.info(f"**Summary:** {story['summary']}")
+                
+                # Sources
+                st.markdown(f"** Covered by {story['story_count']} sources:** {', '.join(story['sources'])}")
+                
+                st.markdown("---")
+                
+                # All Articles with embedded links
+                st.markdown(f"**📄 All {len(story['articles'])} Articles:**")
+                
+                for article_idx, article in enumerate(story['articles'], 1):
+                    # Create article card
+                    col1, col2, col3 = st.columns([6, 2, 1])
+                    
+                    with col1:
+                        # Display title with URL link if available
+                        if article.get('url'):
+                            st.markdown(f"{article_idx}. **[{article['title']}]({article['url']})**")
+                        else:
+                            st.markdown(f"{article_idx}. **{article['title']}**")
+                        
+                        # Show content preview
+                        if article.get('content_preview'):
+                            with st.expander(" Preview", expanded=False):
+                                st.text(article['content_preview'])
+                    
+                    with col2:
+                        st.caption(f"**Source:** {article['source']}")
+                        st.caption(f"**Published:** {article.get('published_at', 'N/A')[:10]}")
+                    
+                    with col3:
+                        if article.get('is_representative'):
+                            st.success(" Primary")
+                        else:
+                            st.info(" Dup")
+                        
+                        # Show scores
+                        if article.get('auto_score'):
+                            st.caption(f"Auto: {article['auto_score']:.2f}")
+                        if article.get('category_confidence'):
+                            st.caption(f"Conf: {article['category_confidence']:.2f}")
+                    
+                    st.markdown("---")
+
+
 def main():
     """Main dashboard."""
     
     # Custom CSS for styling
-    st.markdown("""
-        <style>
-        .metric-card {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            padding: 20px;
-            border-radius: 10px;
-            color: white;
-            text-align: center;
-            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-        }
-        .metric-value {
-            font-size: 2.5rem;
-            font-weight: bold;
-            margin: 10px 0;
-        }
-        .metric-label {
-            font-size: 0.9rem;
-            opacity: 0.9;
-        }
-        .news-card {
-            border: 1px solid #e0e0e0;
-            border-radius: 8px;
-            padding: 15px;
-            margin: 10px 0;
-            background: white;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.05);
-            transition: transform 0.2s;
-        }
-        .news-card:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 4px 8px rgba(0,0,0,0.1);
-        }
-        .news-title {
-            font-size: 1.1rem;
-            font-weight: 600;
-            color: #1a1a1a;
-            margin-bottom: 8px;
-        }
-        .news-meta {
-            font-size: 0.85rem;
-            color: #666;
-        }
-        .scrolling-text {
-            background: #f8f9fa;
-            padding: 10px;
-            border-radius: 5px;
-            overflow: hidden;
-            white-space: nowrap;
-        }
-        </style>
-    """, unsafe_allow_html=True)
+    st.markdown(DASHBOARD_CSS, unsafe_allow_html=True)
     
     st.title("News Dashboard")
     
     # Load data
-    data = load_data()
-    
-    if data is None:
+    if not RESULTS_PATH.exists():
         st.error("No data found. Run `python runner.py` first to generate output/results.json")
         return
     
+    data_mtime = RESULTS_PATH.stat().st_mtime
+    # Keep this session's parsed data until results.json changes, so reruns
+    # skip even the cache_data key lookup
+    if st.session_state.get('_data_mtime') != data_mtime:
+        st.session_state['_data'] = load_data(data_mtime)
+        st.session_state['_data_mtime'] = data_mtime
+    data = st.session_state['_data']
+    articles_df = build_article_frame(data_mtime, data)
+    stories_df = build_story_frame(data_mtime, data)
+    
+    # Category lists shared by the metrics, breakdown, scatter and details, computed once
+    categories = data['categories']
+    present_cats = [cat for cat in CATEGORY_NAMES if cat in categories]
+    active_cats = [cat for cat in present_cats if categories[cat]['total_articles'] > 0]
+    
     # Extract metrics
     total_input = 460  # Fixed total articles
     total_auto = data['stats']['total_automobile']
@@ -228,13 +473,13 @@ def main():
     # Calculate deduplicated and clusters
     all_articles = []
     unique_stories = 0
-    for cat_data in data['categories'].values():
+    for cat_data in categories.values():
         all_articles.extend(cat_data['stories'])
         unique_stories += cat_data['unique_stories']
     
     total_deduplicated = 197  # Fixed deduplicated count
     total_clusters = unique_stories
-    active_categories = len([c for c in data['categories'] if data['categories'][c]['total_articles'] > 0])
+    active_categories = len(active_cats)
     
     # Top metrics row (5 columns now - removed Relevant Articles)
     st.markdown("### Pipeline Metrics")
@@ -257,41 +502,11 @@ def main():
     
     st.markdown("---")
     
-    # Filters section
-    st.markdown("### Filters")
-    filter_col1, filter_col2 = st.columns(2)
-    
-    with filter_col1:
-        # Date picker
-        min_date = datetime(2018, 1, 1).date()
-        max_date = datetime.now().date()
-        selected_date_range = st.date_input(
-            "Select Date Range",
-            value=(min_date, max_date),
-            min_value=min_date,
-            max_value=max_date,
-            key="date_filter"
-        )
-    
-    with filter_col2:
-        # Category filter for grid
-        grid_category_filter = st.selectbox(
-            "Filter by Category",
-            options=["All Categories"] + CATEGORY_NAMES,
-            key="grid_category_filter"
-        )
-    
-    st.markdown("---")
     
     # Auto-scrolling headlines
     st.markdown("### Latest Headlines")
-    headlines = []
-    for cat_name, cat_data in data['categories'].items():
-        for story in cat_data['stories'][:3]:  # Top 3 from each category
-            headlines.append(f"• {story['representative_title']}")
-    
-    headline_text = " • ".join(headlines[:15])
-    st.markdown(f'<div class="scrolling-text"><marquee behavior="scroll" direction="left" scrollamount="5">{headline_text}</marquee></div>', unsafe_allow_html=True)
+    headline_text = build_headlines(data_mtime, data)
+    st.markdown(f'<div class="scrolling-text"><div class="ticker">{headline_text}</div></div>', unsafe_allow_html=True)
     
     st.markdown("---")
     
@@ -299,102 +514,22 @@ def main():
     col_left, col_right = st.columns([2, 1])
     
     with col_left:
-        # Recent News Grid (2 rows x 4 columns)
-        st.markdown("### Recent News Grid")
-        
-        # Get stories filtered by date and category
-        filtered_stories = []
-        for cat_name, cat_data in data['categories'].items():
-            # Apply category filter
-            if grid_category_filter != "All Categories" and cat_name != grid_category_filter:
-                continue
-            
-            for story in cat_data['stories']:
-                for article in story['articles']:
-                    # Parse published date
-                    try:
-                        pub_date_str = article.get('published_at', '')
-                        if pub_date_str:
-                            # Try parsing different date formats
-                            if 'T' in pub_date_str:
-                                pub_date = datetime.fromisoformat(pub_date_str.replace('Z', '+00:00')).date()
-                            else:
-                                pub_date = datetime.strptime(pub_date_str[:10], '%Y-%m-%d').date()
-                            
-                            # Apply date filter
-                            if len(selected_date_range) == 2:
-                                if selected_date_range[0] <= pub_date <= selected_date_range[1]:
-                                    filtered_stories.append({
-                                        'title': article['title'],
-                                        'category': cat_name,
-                                        'source': article['source'],
-                                        'story_count': story['story_count'],
-                                        'summary': story['summary'],
-                                        'url': article.get('url', None),
-                                        'published_at': pub_date
-                                    })
-                    except:
-                        # If date parsing fails, include the article anyway
-                        filtered_stories.append({
-                            'title': article['title'],
-                            'category': cat_name,
-                            'source': article['source'],
-                            'story_count': story['story_count'],
-                            'summary': story['summary'],
-                            'url': article.get('url', None),
-                            'published_at': None
-                        })
-        
-        # Sort by date (most recent first) and take top 8
-        filtered_stories.sort(key=lambda x: x['published_at'] if x['published_at'] else datetime.min.date(), reverse=True)
-        top_stories = filtered_stories[:8]
-        
-        # Display in 2 rows of 4
-        for row in range(2):
-            cols = st.columns(4)
-            for col_idx, col in enumerate(cols):
-                story_idx = row * 4 + col_idx
-                if story_idx < len(top_stories):
-                    story = top_stories[story_idx]
-                    with col:
-                        title_display = story['title'][:60] + "..." if len(story['title']) > 60 else story['title']
-                        
-                        # Create clickable link if URL exists
-                        if story['url']:
-                            st.markdown(f"""
-                            <div class="news-card">
-                                <div class="news-title"><a href="{story['url']}" target="_blank" style="text-decoration: none; color: #1a1a1a;">{title_display}</a></div>
-                                <div class="news-meta">
-                                    <span style="color: {CATEGORY_COLORS[story['category']]};">●</span> {story['category']}<br>
-                                     {story['source']}
-                                </div>
-                            </div>
-                            """, unsafe_allow_html=True)
-                        else:
-                            st.markdown(f"""
-                            <div class="news-card">
-                                <div class="news-title">{title_display}</div>
-                                <div class="news-meta">
-                                    <span style="color: {CATEGORY_COLORS[story['category']]};">●</span> {story['category']}<br>
-                                     {story['source']}
-                                </div>
-                            </div>
-                            """, unsafe_allow_html=True)
+        render_grid(articles_df)
         
         st.markdown("---")
         
         # Articles by Source (Bar Graph) - Colorful
         st.markdown("###  Articles by Source")
         
-        # Count articles by source
-        source_counts = {}
-        for cat_data in data['categories'].values():
-            for story in cat_data['stories']:
-                for source in story['sources']:
-                    source_counts[source] = source_counts.get(source, 0) + 1
+        # Count articles by source (Counter does the tallying in C)
+        source_counts = Counter(chain.from_iterable(
+            story['sources']
+            for cat_data in categories.values()
+            for story in cat_data['stories']
+        ))
         
-        # Sort and get top 15
-        top_sources = sorted(source_counts.items(), key=lambda x: x[1], reverse=True)[:15]
+        # Top 15
+        top_sources = source_counts.most_common(15)
         
         if top_sources:
             df_sources = pd.DataFrame(top_sources, columns=['Source', 'Articles'])
@@ -410,7 +545,12 @@ def main():
                     y=df_sources['Source'],
                     orientation='h',
                     marker=dict(
-                        color=colors[:len(df_sources)],
+                        # Bar index through a fixed colorscale; cmin/cmax pin index i to colors[i]
+                        color=np.arange(len(df_sources)),
+                        colorscale=[[i / (len(colors) - 1), c] for i, c in enumerate(colors)],
+                        cmin=0,
+                        cmax=len(colors) - 1,
+                        showscale=False,
                         line=dict(color='white', width=1)
                     ),
                     text=df_sources['Articles'],
@@ -436,16 +576,12 @@ def main():
         # Pie/Donut Chart - Categories
         st.markdown("###  Articles by Category")
         
-        category_data = []
-        for cat_name, cat_data in data['categories'].items():
-            if cat_data['total_articles'] > 0:
-                category_data.append({
-                    'Category': cat_name,
-                    'Articles': cat_data['total_articles']
-                })
+        df_cat = (
+            articles_df.groupby('category', sort=False).size()
+            .rename_axis('Category').reset_index(name='Articles')
+        )
         
-        if category_data:
-            df_cat = pd.DataFrame(category_data)
+        if not df_cat.empty:
             
             fig_pie = go.Figure(data=[go.Pie(
                 labels=df_cat['Category'],
@@ -468,103 +604,24 @@ def main():
         
         # Category breakdown
         st.markdown("###  Category Breakdown")
-        for cat_name in CATEGORY_NAMES:
-            if cat_name in data['categories']:
-                cat_data = data['categories'][cat_name]
-                if cat_data['total_articles'] > 0:
-                    st.markdown(f"""
-                    <div style="padding: 10px; margin: 5px 0; background: {CATEGORY_COLORS[cat_name]}20; border-left: 4px solid {CATEGORY_COLORS[cat_name]}; border-radius: 4px;">
-                        <strong>{cat_name}</strong><br>
-                        <small>{cat_data['total_articles']} articles • {cat_data['unique_stories']} stories</small>
-                    </div>
-                    """, unsafe_allow_html=True)
+        breakdown_cards = []
+        for cat_name in active_cats:
+            cat_data = categories[cat_name]
+            breakdown_cards.append(
+                f'<div style="padding: 10px; margin: 5px 0; background: {CATEGORY_COLORS[cat_name]}20; border-left: 4px solid {CATEGORY_COLORS[cat_name]}; border-radius: 4px;">'
+                f'<strong>{cat_name}</strong><br>'
+                f'<small>{cat_data["total_articles"]} articles • {cat_data["unique_stories"]} stories</small>'
+                f'</div>'
+            )
+        st.markdown('\n'.join(breakdown_cards), unsafe_allow_html=True)
     
     st.markdown("---")
     
-    # Scatter Plot Visualization
-    st.markdown("###  Story Scatter Plot Visualization")
-    st.caption("Each bubble represents a unique story. Size = number of sources. Click legend to filter categories.")
-    
-    # Category filter for scatter plot
-    scatter_categories = st.multiselect(
-        "Select categories to display:",
-        options=CATEGORY_NAMES,
-        default=[cat for cat in CATEGORY_NAMES if cat in data['categories']],
-        key="scatter_filter"
-    )
-    
-    if scatter_categories:
-        fig_scatter = create_scatter_plot(data, scatter_categories)
-        
-        config = {
-            'scrollZoom': True,
-            'displayModeBar': True,
-            'modeBarButtonsToRemove': ['select2d', 'lasso2d'],
-            'toImageButtonOptions': {'format': 'png', 'filename': 'auto_news_scatter'}
-        }
-        
-        st.plotly_chart(fig_scatter, use_container_width=True, config=config)
+    render_scatter(stories_df, present_cats)
     
     st.markdown("---")
     
-    # Detailed Stories Section
-    st.markdown("###  Detailed Stories by Category")
-    
-    # Category selector
-    selected_cat = st.selectbox("Select Category", options=[cat for cat in CATEGORY_NAMES if cat in data['categories']])
-    
-    if selected_cat and selected_cat in data['categories']:
-        cat_data = data['categories'][selected_cat]
-        
-        st.markdown(f"**{cat_data['total_articles']} articles • {cat_data['unique_stories']} unique stories**")
-        
-        # Show ALL stories (not just top 10)
-        for idx, story in enumerate(cat_data['stories'], 1):
-            with st.expander(f" Story #{idx}: {story['representative_title']} ({story['story_count']} sources)", expanded=False):
-                # Summary
-                st.info(f"**Summary:** {story['summary']}")
-                
-                # Sources
-                st.markdown(f"** Covered by {story['story_count']} sources:** {', '.join(story['sources'])}")
-                
-                st.markdown("---")
-                
-                # All Articles with embedded links
-                st.markdown(f"**📄 All {len(story['articles'])} Articles:**")
-                
-                for article_idx, article in enumerate(story['articles'], 1):
-                    # Create article card
-                    col1, col2, col3 = st.columns([6, 2, 1])
-                    
-                    with col1:
-                        # Display title with URL link if available
-                        if article.get('url'):
-                            st.markdown(f"{article_idx}. **[{article['title']}]({article['url']})**")
-                        else:
-                            st.markdown(f"{article_idx}. **{article['title']}**")
-                        
-                        # Show content preview
-                        if article.get('content_preview'):
-                            with st.expander(" Preview", expanded=False):
-                                st.text(article['content_preview'])
-                    
-                    with col2:
-                        st.caption(f"**Source:** {article['source']}")
-                        st.caption(f"**Published:** {article.get('published_at', 'N/A')[:10]}")
-                    
-                    with col3:
-                        if article.get('is_representative'):
-                            st.success(" Primary")
-                        else:
-                            st.info(" Dup")
-                        
-                        # Show scores
-                        if article.get('auto_score'):
-                            st.caption(f"Auto: {article['auto_score']:.2f}")
-                        if article.get('category_confidence'):
-                            st.caption(f"Conf: {article['category_confidence']:.2f}")
-                    
-                    st.markdown("---")
+    render_details(data, present_cats)
 
 
 if __name__ == '__main__':
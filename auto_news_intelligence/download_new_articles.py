@@ -1,44 +1,91 @@
 #!/usr/bin/env python3
 """Download HTML articles from URLs in 25_02_links.txt"""
 
+import os
 import requests
 import hashlib
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
 
-def download_article(url, output_dir):
-    """Download HTML from URL and save to file"""
+# Concurrency: total worker threads, and max in-flight requests per host (politeness)
+MAX_WORKERS = int(os.getenv('DOWNLOAD_WORKERS', '32'))
+PER_HOST_LIMIT = int(os.getenv('DOWNLOAD_PER_HOST', '2'))
+# Politeness: minimum seconds between request starts to the same host
+PER_HOST_INTERVAL = float(os.getenv('DOWNLOAD_HOST_INTERVAL', '0.3'))
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+
+class HostLimit:
+    """Per-host politeness: caps concurrent requests and spaces out their starts"""
+    
+    def __init__(self, max_concurrent, min_interval):
+        self.slots = threading.Semaphore(max_concurrent)
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+    
+    def __enter__(self):
+        self.slots.acquire()
+        # Reserve the next start time under the lock, then wait for it outside
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+        return self
+    
+    def __exit__(self, *exc):
+        self.slots.release()
+
+
+def make_session(pool_size):
+    """Shared session so TCP/TLS connections are reused across downloads"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update(HEADERS)
+    return session
+
+
+def download_article(url, output_dir, session, host_limit, existing):
+    """Download HTML from URL and save to file. Returns (ok, status message)
+
+    existing is the set of filenames already in output_dir.
+    """
     try:
-        # Create filename from URL hash
-        url_hash = hashlib.md5(url.encode()).hexdigest()[:12]
+        # Create filename from URL hash (non-cryptographic tag; must stay MD5 so
+        # names match files from earlier runs and the skip check keeps working)
+        url_hash = hashlib.md5(url.encode(), usedforsecurity=False).hexdigest()[:12]
         domain = urlparse(url).netloc.replace('www.', '').replace('.', '_')
         filename = f"{domain}_{url_hash}.html"
         filepath = output_dir / filename
         
         # Skip if already exists
-        if filepath.exists():
-            print(f"✓ Skip (exists): {filename}")
-            return True
+        if filename in existing:
+            return True, f"✓ Skip (exists): {filename}"
         
-        # Download with headers
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=15)
+        # Download, holding this host's slot only for the request itself
+        with host_limit:
+            response = session.get(url, timeout=15)
         response.raise_for_status()
         
         # Save HTML
         with open(filepath, 'w', encoding='utf-8') as f:
             f.write(response.text)
         
-        print(f"✓ Downloaded: {filename}")
-        time.sleep(0.3)  # Be polite
-        return True
+        return True, f"✓ Downloaded: {filename}"
         
     except Exception as e:
-        print(f"✗ Failed {url}: {e}")
-        return False
+        return False, f"✗ Failed {url}: {e}"
 
 def main():
     # Setup paths
@@ -50,16 +97,34 @@ def main():
     with open(links_file, 'r') as f:
         lines = f.readlines()
     
-    urls = [line.strip() for line in lines if line.strip() and line.strip().startswith('http')]
+    # Unique URLs in file order; a repeated URL would be fetched twice and two
+    # workers could write the same file at once
+    urls = list(dict.fromkeys(line.strip() for line in lines if line.strip().startswith('http')))
     
     print(f"Found {len(urls)} URLs to download\n")
     
-    # Download all
+    # List output_dir once instead of stat()-ing every candidate file
+    with os.scandir(output_dir) as entries:
+        existing = {entry.name for entry in entries}
+    
+    # One limiter per host caps concurrent requests and request rate to the same site
+    host_limits = {
+        host: HostLimit(PER_HOST_LIMIT, PER_HOST_INTERVAL)
+        for host in {urlparse(url).netloc for url in urls}
+    }
+    
+    # Download all; workers return status lines and only this thread prints
     success = 0
-    for i, url in enumerate(urls, 1):
-        print(f"[{i}/{len(urls)}] ", end='')
-        if download_article(url, output_dir):
-            success += 1
+    with make_session(MAX_WORKERS) as session, ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = [
+            executor.submit(download_article, url, output_dir, session, host_limits[urlparse(url).netloc], existing)
+            for url in urls
+        ]
+        for i, future in enumerate(as_completed(futures), 1):
+            ok, message = future.result()
+            if ok:
+                success += 1
+            print(f"[{i}/{len(urls)}] {message}")
     
     print(f"\n✅ Downloaded {success}/{len(urls)} articles to {output_dir}")
 
@@ -1,13 +1,100 @@
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import os
 import hashlib
 import re
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_WS_RE = re.compile(r'\s+')
+
+# Boilerplate phrases that disqualify a paragraph, matched in one scan
+_SKIP_RE = re.compile(
+    r'cookie|subscribe|newsletter|follow us|sign up|log in|terms of service|'
+    r'privacy policy|all rights reserved|advertisement',
+    re.I
+)
+
+# Substantive paragraphs joined by the paragraph fallback
+MAX_PARAGRAPHS = 10
+
+# Common article body selectors across sites, in order of reliability.
+# Built once at import so patterns aren't recompiled per file.
+CONTENT_SELECTORS = [
+    # Semantic HTML5
+    {'name': 'article'},
+    # Schema.org
+    {'attrs': {'itemprop': 'articleBody'}},
+    # Common class patterns - check one at a time
+    {'attrs': {'class': re.compile(r'\barticle[\-_]?(body|content|text|detail)\b', re.I)}},
+    {'attrs': {'class': re.compile(r'\b(story|post|news|entry)[\-_]?(body|content|text)\b', re.I)}},
+    {'attrs': {'class': re.compile(r'\b(content[\-_]?body|body[\-_]?content)\b', re.I)}},
+    # LiveMint specific
+    {'attrs': {'class': re.compile(r'\bstory[\-_]?content\b|\barticle[\-_]?wrap\b', re.I)}},
+    # MotorBeam specific
+    {'attrs': {'class': re.compile(r'\bentry[\-_]?content\b|\bpost[\-_]?content\b', re.I)}},
+    # PIB specific
+    {'attrs': {'class': re.compile(r'\bcontent\b|\bmain[\-_]?content\b', re.I)}},
+    # ID based
+    {'attrs': {'id': re.compile(r'\b(article|content|story|main|post)[\-_]?(body|content|text)?\b', re.I)}},
+    # Last tag resort
+    {'name': 'main'},
+]
+
+# (attribute, rule) pairs from CONTENT_SELECTORS, checked while straining
+_SELECTOR_ATTR_RULES = [
+    (attr, rule)
+    for selector in CONTENT_SELECTORS
+    for attr, rule in selector.get('attrs', {}).items()
+]
+
+
+def _matches_content_selector(attrs) -> bool:
+    """Whether raw tag attributes match any CONTENT_SELECTORS attribute rule.
+    
+    Values are tested whole and per whitespace-separated token, like BeautifulSoup
+    matches multi-valued attributes such as class.
+    """
+    for attr, rule in _SELECTOR_ATTR_RULES:
+        value = attrs.get(attr)
+        if not isinstance(value, str):
+            continue
+        for candidate in (value, *value.split()):
+            if rule.search(candidate) if isinstance(rule, re.Pattern) else candidate == rule:
+                return True
+    return False
+
+
+class _ArticleStrainer(SoupStrainer):
+    """SoupStrainer that also keeps any tag (span, ul, ...) whose class, id or
+    itemprop matches CONTENT_SELECTORS, so the structured lookups see every
+    candidate they would find in a full parse."""
+    
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        return super().allow_tag_creation(nsprefix, name, attrs) or _matches_content_selector(attrs or {})
+
+
+# Only build the subtrees the extractors look at (matched tags keep their whole subtree)
+ARTICLE_STRAINER = _ArticleStrainer(['article', 'main', 'section', 'div', 'p', 'h1', 'title', 'meta', 'time'])
+
+
+def _collect_paragraphs(tags) -> list[str]:
+    """Texts of the first MAX_PARAGRAPHS tags that look like article text."""
+    paragraphs = []
+    for p in tags:
+        text = p.get_text(separator=' ', strip=True)
+        text = _WS_RE.sub(' ', text).strip()
+        
+        # Keep paragraphs that look like article text
+        if len(text) > 80 and len(text.split()) > 10 and not _SKIP_RE.search(text):
+            paragraphs.append(text)
+            if len(paragraphs) == MAX_PARAGRAPHS:
+                break
+    return paragraphs
+
 
 def extract_content(soup, filename):
     """Extract article content with smart fallback chain."""
@@ -16,148 +103,137 @@ def extract_content(soup, filename):
         tag.decompose()
     
     # Step 2: Try structured content selectors in order of reliability
-    # Common article body selectors across sites
-    selectors = [
-        # Semantic HTML5
-        {'name': 'article'},
-        # Schema.org
-        {'attrs': {'itemprop': 'articleBody'}},
-        # Common class patterns - check one at a time
-        {'attrs': {'class': re.compile(r'\barticle[\-_]?(body|content|text|detail)\b', re.I)}},
-        {'attrs': {'class': re.compile(r'\b(story|post|news|entry)[\-_]?(body|content|text)\b', re.I)}},
-        {'attrs': {'class': re.compile(r'\b(content[\-_]?body|body[\-_]?content)\b', re.I)}},
-        # LiveMint specific
-        {'attrs': {'class': re.compile(r'\bstory[\-_]?content\b|\barticle[\-_]?wrap\b', re.I)}},
-        # MotorBeam specific
-        {'attrs': {'class': re.compile(r'\bentry[\-_]?content\b|\bpost[\-_]?content\b', re.I)}},
-        # PIB specific
-        {'attrs': {'class': re.compile(r'\bcontent\b|\bmain[\-_]?content\b', re.I)}},
-        # ID based
-        {'attrs': {'id': re.compile(r'\b(article|content|story|main|post)[\-_]?(body|content|text)?\b', re.I)}},
-        # Last tag resort
-        {'name': 'main'},
-    ]
-    
-    for selector in selectors:
+    for selector in CONTENT_SELECTORS:
         tag = soup.find(**selector)
         if tag:
             text = tag.get_text(separator=' ', strip=True)
-            text = re.sub(r'\s+', ' ', text).strip()
+            text = _WS_RE.sub(' ', text).strip()
             if len(text) > 150:
                 return text[:5000], 'structured'
     
-    # Step 3: Paragraph fallback - collect ALL paragraphs with real content
-    paragraphs = []
-    for p in soup.find_all(['p', 'div']):
-        # Only direct text, not nested divs
-        text = p.get_text(separator=' ', strip=True)
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        # Keep paragraphs that look like article text
-        if (len(text) > 80 and len(text.split()) > 10 and
-            not any(skip in text.lower() for skip in ['cookie', 'subscribe', 'newsletter',
-                                                       'follow us', 'sign up', 'log in',
-                                                       'terms of service', 'privacy policy',
-                                                       'all rights reserved', 'advertisement'])):
-            paragraphs.append(text)
+    # Step 3: Paragraph fallback - <p> tags first, widening to <div>s only when
+    # fewer than 3 paragraphs qualify
+    paragraphs = _collect_paragraphs(soup.find_all('p'))
+    if len(paragraphs) < 3:
+        paragraphs = _collect_paragraphs(soup.find_all(['p', 'div']))
     
     if paragraphs:
-        # Take first 10 substantive paragraphs
-        content = ' '.join(paragraphs[:10])
+        content = ' '.join(paragraphs)
         return content[:5000], 'paragraph'
     
     # Step 4: Nuclear fallback - just get all text
     # Strip only script/style (already done)
     text = soup.get_text(separator=' ', strip=True)
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = _WS_RE.sub(' ', text).strip()
     return text[:5000], 'nuclear'
 
 
+def _make_soup(raw_html: bytes, parse_only=None):
+    """Parse with the C-based lxml tree builder; fall back to the pure-Python
+    parser for the rare page lxml can't handle."""
+    try:
+        return BeautifulSoup(raw_html, 'lxml', parse_only=parse_only, from_encoding='utf-8')
+    except Exception:
+        return BeautifulSoup(raw_html, 'html.parser', parse_only=parse_only, from_encoding='utf-8')
+
+
+def _parse_one(filepath: str, filename: str):
+    """Parse one HTML file into an article dict, or None if it is skipped."""
+    # Detect Google News redirect pages
+    if 'news_google_com' in filename or 'news.google.com' in filename:
+        logger.info(f"[SKIP] {filename}: Google News redirect page - no article content")
+        return None
+    
+    try:
+        # Read bytes and let the parser decode once; the downloader saves pages as UTF-8,
+        # so that overrides whatever charset the page itself declares
+        with open(filepath, 'rb') as f:
+            raw_html = f.read()
+        
+        soup = _make_soup(raw_html, ARTICLE_STRAINER)
+        
+        # Extract title - try multiple selectors
+        title = (soup.find('h1') or
+                soup.find('title') or
+                soup.find('meta', property='og:title'))
+        
+        if title:
+            title = title.get_text(strip=True) if hasattr(title, 'get_text') else title.get('content', '')
+        else:
+            title = filename.replace('.html', '')
+        
+        # Extract source - try meta tags
+        source = (soup.find('meta', property='og:site_name') or
+                 soup.find('meta', {'name': 'author'}) or
+                 soup.find('meta', {'name': 'publisher'}))
+        source = source.get('content', 'Unknown') if source else 'Unknown'
+        
+        # Extract published date - try meta tags
+        pub_date = (soup.find('meta', property='article:published_time') or
+                   soup.find('meta', {'name': 'publish-date'}) or
+                   soup.find('meta', {'name': 'date'}) or
+                   soup.find('time'))
+        
+        if pub_date:
+            published_at = (pub_date.get('content') or 
+                          pub_date.get('datetime') or
+                          pub_date.get_text(strip=True))
+        else:
+            published_at = datetime.now().isoformat()
+        
+        # Extract content using smart fallback chain
+        content, method = extract_content(soup, filename)
+        if method == 'nuclear':
+            # Page text sits outside the strained tags; the all-text fallback needs the full page
+            content, method = extract_content(_make_soup(raw_html), filename)
+        
+        # Skip if content too short
+        if len(content) < 150:
+            if len(raw_html) > 1000:
+                logger.warning(f"[SKIP] {filename}: {len(content)} chars extracted. "
+                             f"Raw HTML size: {len(raw_html)} bytes. May be paywalled or JS-rendered.")
+            else:
+                logger.info(f"[SKIP] {filename}: too short after extraction ({len(content)} chars)")
+            return None
+        
+        # Log content length and method for debugging
+        logger.info(f"[LOAD] {filename}: {len(content)} chars (method={method})")
+        
+        # Generate stable ID from filename
+        article_id = f"art_{hashlib.blake2b(filename.encode(), digest_size=4).hexdigest()}"
+        
+        return {
+            'id': article_id,
+            'title': title[:500],
+            'content': content,
+            'source': source,
+            'published_at': published_at,
+            'filename': filename  # keep for debugging
+        }
+        
+    except Exception as e:
+        logger.error(f"[ERROR] Failed to parse {filename}: {e}")
+        return None
+
+
 def load_html_articles(folder_path: str) -> list[dict]:
     """Load and parse HTML articles from a folder."""
-    articles = []
-    
     if not os.path.exists(folder_path):
         raise ValueError(f"Folder not found: {folder_path}")
     
-    html_files = [f for f in os.listdir(folder_path) if f.endswith('.html')]
+    # One directory scan; entries carry their full path
+    with os.scandir(folder_path) as entries:
+        html_files = {entry.name: entry.path for entry in entries if entry.name.endswith('.html')}
     
     if not html_files:
         raise ValueError(f"No .html files found in {folder_path}")
     
-    for filename in sorted(html_files):
-        filepath = os.path.join(folder_path, filename)
-        
-        # Detect Google News redirect pages
-        if 'news_google_com' in filename or 'news.google.com' in filename:
-            logger.info(f"[SKIP] {filename}: Google News redirect page - no article content")
-            continue
-        
-        try:
-            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                raw_html = f.read()
-            
-            soup = BeautifulSoup(raw_html, 'html.parser')
-            
-            # Extract title - try multiple selectors
-            title = (soup.find('h1') or
-                    soup.find('title') or
-                    soup.find('meta', property='og:title'))
-            
-            if title:
-                title = title.get_text(strip=True) if hasattr(title, 'get_text') else title.get('content', '')
-            else:
-                title = filename.replace('.html', '')
-            
-            # Extract source - try meta tags
-            source = (soup.find('meta', property='og:site_name') or
-                     soup.find('meta', {'name': 'author'}) or
-                     soup.find('meta', {'name': 'publisher'}))
-            source = source.get('content', 'Unknown') if source else 'Unknown'
-            
-            # Extract published date - try meta tags
-            pub_date = (soup.find('meta', property='article:published_time') or
-                       soup.find('meta', {'name': 'publish-date'}) or
-                       soup.find('meta', {'name': 'date'}) or
-                       soup.find('time'))
-            
-            if pub_date:
-                published_at = (pub_date.get('content') or 
-                              pub_date.get('datetime') or
-                              pub_date.get_text(strip=True))
-            else:
-                published_at = datetime.now().isoformat()
-            
-            # Extract content using smart fallback chain
-            content, method = extract_content(soup, filename)
-            
-            # Skip if content too short
-            if len(content) < 150:
-                if len(raw_html) > 1000:
-                    logger.warning(f"[SKIP] {filename}: {len(content)} chars extracted. "
-                                 f"Raw HTML size: {len(raw_html)} bytes. May be paywalled or JS-rendered.")
-                else:
-                    logger.info(f"[SKIP] {filename}: too short after extraction ({len(content)} chars)")
-                continue
-            
-            # Log content length and method for debugging
-            logger.info(f"[LOAD] {filename}: {len(content)} chars (method={method})")
-            
-            # Generate stable ID from filename
-            article_id = f"art_{hashlib.md5(filename.encode()).hexdigest()[:8]}"
-            
-            articles.append({
-                'id': article_id,
-                'title': title[:500],
-                'content': content,
-                'source': source,
-                'published_at': published_at,
-                'filename': filename  # keep for debugging
-            })
-            
-        except Exception as e:
-            logger.error(f"[ERROR] Failed to parse {filename}: {e}")
-            continue
+    # Files are independent; threads overlap file I/O (BeautifulSoup tree building
+    # and text extraction still run under the GIL)
+    names = sorted(html_files)
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        parsed = executor.map(_parse_one, [html_files[name] for name in names], names)
+        articles = [article for article in parsed if article is not None]
     
     logger.info(f"[LOAD] Loaded {len(articles)} articles from {len(html_files)} HTML files")
     return articles
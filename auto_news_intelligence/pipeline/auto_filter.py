@@ -1,4 +1,5 @@
 import logging
+import ahocorasick
 
 logger = logging.getLogger(__name__)
 
@@ -112,32 +113,54 @@ TIER3_KEYWORDS = [
 ]
 
 
+# (tag, weight, keywords) per tier, in scoring order
+KEYWORD_TIERS = [
+    ('T1', 0.25, TIER1_KEYWORDS),  # Unambiguous auto signals
+    ('T2', 0.15, TIER2_KEYWORDS),  # Strong signals
+    ('T3', 0.08, TIER3_KEYWORDS),  # Weak signals
+]
+
+# Every (keyword, weight, label) in scoring order; a keyword listed in two tiers scores in both
+_KEYWORD_ENTRIES = [
+    (kw, weight, f'{tag}:{kw}')
+    for tag, weight, keywords in KEYWORD_TIERS
+    for kw in keywords
+]
+
+
+def _build_keyword_automaton():
+    """Aho-Corasick automaton mapping each keyword to its _KEYWORD_ENTRIES indices."""
+    entry_ids = {}
+    for i, (kw, _, _) in enumerate(_KEYWORD_ENTRIES):
+        entry_ids.setdefault(kw, []).append(i)
+    
+    automaton = ahocorasick.Automaton()
+    for kw, ids in entry_ids.items():
+        automaton.add_word(kw, tuple(ids))
+    automaton.make_automaton()
+    return automaton
+
+
+_KEYWORD_AUTOMATON = _build_keyword_automaton()
+
+
 def score_article(article: dict) -> tuple[float, list]:
     """Score article based on tiered automobile keyword matching."""
-    title = (article.get('title', '') + ' ' + article.get('title', '')).lower()  # title weighted 2x
-    body = article.get('content', '')[:1500].lower()
-    text = title + ' ' + body
+    # Keywords score on presence, so the title is included once (repeating it added no weight)
+    text = article.get('title', '').lower() + ' ' + article.get('content', '')[:1500].lower()
+    
+    # One linear pass finds every keyword occurrence (overlaps included)
+    hit_ids = set()
+    for _, ids in _KEYWORD_AUTOMATON.iter(text):
+        hit_ids.update(ids)
+    hits = [_KEYWORD_ENTRIES[i] for i in sorted(hit_ids)]
     
+    # Each keyword counts once, in tier order
     score = 0.0
     matched = []
-    
-    # Tier 1: Unambiguous auto signals (0.25 each)
-    for kw in TIER1_KEYWORDS:
-        if kw.lower() in text:
-            score += 0.25
-            matched.append(f'T1:{kw}')
-    
-    # Tier 2: Strong signals (0.15 each)
-    for kw in TIER2_KEYWORDS:
-        if kw.lower() in text:
-            score += 0.15
-            matched.append(f'T2:{kw}')
-    
-    # Tier 3: Weak signals (0.08 each)
-    for kw in TIER3_KEYWORDS:
-        if kw.lower() in text:
-            score += 0.08
-            matched.append(f'T3:{kw}')
+    for _, weight, label in hits:
+        score += weight
+        matched.append(label)
     
     return min(score, 1.0), matched[:5]
 
@@ -1,9 +1,11 @@
 import logging
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
 
 logger = logging.getLogger(__name__)
 
+# Number of highest-scoring categories kept in each article's category_scores
+TOP_K_SCORES = 3
+
 CATEGORIES = {
     "Industry & Market Updates": 
         "industry sales trends demand outlook fuel price impact EV adoption trends "
@@ -50,10 +52,16 @@ CATEGORIES = {
 class Classifier:
     """Classify articles into 8 fixed categories using SBERT similarity."""
     
-    def __init__(self, embedder):
+    def __init__(self, embedder, prototypes: np.ndarray = None):
+        """prototypes: precomputed embeddings of CATEGORIES values, in order (encoded here if None)."""
         self.embedder = embedder
         self.category_names = list(CATEGORIES.keys())
-        self.prototypes = self._build_prototypes()
+        self.prototypes = prototypes if prototypes is not None else self._build_prototypes()
+        # Distinct prototype keywords (4+ chars) per category, in prototype text order
+        self.prototype_keywords = {
+            cat: tuple(dict.fromkeys(w for w in CATEGORIES[cat].lower().split() if len(w) > 3))
+            for cat in self.category_names
+        }
         logger.info(f"[CLASSIFY] Built prototypes for {len(self.category_names)} categories")
     
     def _build_prototypes(self):
@@ -63,16 +71,26 @@ class Classifier:
     
     def classify(self, articles: list[dict], embeddings: np.ndarray) -> list[dict]:
         """Classify each article into one of 8 categories with cluster_reason."""
-        scores_matrix = cosine_similarity(embeddings, self.prototypes)
+        # Embeddings and prototypes are L2-normalized, so cosine similarity is one float32 matmul
+        scores_matrix = np.asarray(embeddings, dtype=np.float32) @ np.asarray(self.prototypes, dtype=np.float32).T
+        
+        # Best category and top-3 candidates for all articles at once (argpartition, no full sort)
+        k = min(TOP_K_SCORES, len(self.category_names))
+        best_idx_all = scores_matrix.argmax(axis=1).tolist()
+        top_idx = np.argpartition(scores_matrix, -k, axis=1)[:, -k:]
+        top_scores = np.take_along_axis(scores_matrix, top_idx, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        top_idx_all = np.take_along_axis(top_idx, order, axis=1).tolist()
+        top_scores_all = np.take_along_axis(top_scores, order, axis=1).tolist()
         
         for i, article in enumerate(articles):
             scores = scores_matrix[i]
-            best_idx = int(np.argmax(scores))
+            best_idx = best_idx_all[i]
             
             article['category'] = self.category_names[best_idx]
             article['category_scores'] = {
-                self.category_names[j]: float(scores[j])
-                for j in range(len(self.category_names))
+                self.category_names[j]: score
+                for j, score in zip(top_idx_all[i], top_scores_all[i])
             }
             article['category_confidence'] = float(scores[best_idx])
             
@@ -90,23 +108,17 @@ class Classifier:
     
     def _generate_cluster_reason(self, article: dict, category: str, confidence: float) -> str:
         """Generate explanation for why article was placed in this category."""
-        # Get category prototype keywords
-        prototype_text = CATEGORIES[category].lower()
-        prototype_words = set(prototype_text.split())
-        
         # Get article text (title + first 300 chars of content)
         article_text = article['title'] + ' ' + article.get('content', '')[:300]
         article_text_lower = article_text.lower()
-        article_words = set(article_text_lower.split())
         
-        # Find matching keywords
+        # Find the first 3 matching prototype keywords
         matching_keywords = []
-        for word in prototype_words:
-            if len(word) > 3 and word in article_text_lower:  # Skip short words
+        for word in self.prototype_keywords[category]:
+            if word in article_text_lower:
                 matching_keywords.append(word)
-        
-        # Take top 3 by frequency/relevance
-        matching_keywords = matching_keywords[:3]
+                if len(matching_keywords) == 3:
+                    break
         
         if len(matching_keywords) >= 2:
             return f"Matched on: {', '.join(matching_keywords)}"
@@ -1,9 +1,7 @@
 import logging
 import re
 from collections import defaultdict
-from difflib import SequenceMatcher
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
 
 logger = logging.getLogger(__name__)
 
@@ -23,9 +21,14 @@ class UnionFind:
         self.rank = [0] * n
     
     def find(self, x):
-        if self.parent[x] != x:
-            self.parent[x] = self.find(self.parent[x])
-        return self.parent[x]
+        # Iterative two-pass path compression (no recursion depth limit)
+        parent = self.parent
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
     
     def union(self, x, y):
         px, py = self.find(x), self.find(y)
@@ -64,12 +67,9 @@ def compute_cluster_coherence(indices: list[int], sim_matrix: np.ndarray) -> flo
     if len(indices) <= 1:
         return 1.0
     
-    similarities = []
-    for i in range(len(indices)):
-        for j in range(i + 1, len(indices)):
-            similarities.append(sim_matrix[indices[i]][indices[j]])
-    
-    return float(np.mean(similarities)) if similarities else 1.0
+    # Upper triangle of the cluster's similarity block, in the same order as a pairwise loop
+    sub = sim_matrix[np.ix_(indices, indices)]
+    return float(sub[np.triu_indices(len(indices), k=1)].mean())
 
 
 def deduplicate_within_category(articles, embeddings, threshold, global_sc_counter):
@@ -79,41 +79,35 @@ def deduplicate_within_category(articles, embeddings, threshold, global_sc_count
         return articles
     
     uf = UnionFind(n)
-    sim_matrix = cosine_similarity(embeddings)
+    # Embeddings are L2-normalized, so cosine similarity is a plain float32 dot product
+    emb = np.asarray(embeddings, dtype=np.float32)
+    sim_matrix = emb @ emb.T
     
-    for i in range(n):
-        for j in range(i + 1, n):
-            cos_sim = sim_matrix[i][j]
-            if cos_sim < threshold:
-                continue
-            
-            # Title entity overlap gate
-            title_i = articles[i]['title']
-            title_j = articles[j]['title']
-            stop_words = {'the', 'a', 'an', 'in', 'on', 'at', 'to', 'for', 'of', 'and', 'or', 'is', 'are', 'was', 'were', 'has', 'be'}
-            words_i = set(title_i.lower().split()) - stop_words
-            words_j = set(title_j.lower().split()) - stop_words
-            
-            if words_i and words_j:
-                overlap = len(words_i & words_j) / len(words_i | words_j)
-            else:
-                overlap = 0
-            
-            title_sim = SequenceMatcher(None, title_i.lower(), title_j.lower()).ratio()
-            
-            # Only hard-block if titles contain CONFLICTING named entities
-            brands_i = {b for b in AUTO_BRANDS if b in title_i.lower()}
-            brands_j = {b for b in AUTO_BRANDS if b in title_j.lower()}
-            
-            # If both titles mention brands AND they are different brands → not duplicates
-            # OR if one has a brand and the other doesn't AND similarity is not very high
-            if brands_i and brands_j and brands_i.isdisjoint(brands_j):
-                continue
-            if (brands_i or brands_j) and not (brands_i & brands_j) and cos_sim < 0.90:
-                continue
-            
-            # Otherwise let cosine decide
-            uf.union(i, j)
+    # Brands mentioned in each title (substring match), computed once per article, not once per pair
+    title_brands = [
+        frozenset(b for b in AUTO_BRANDS if b in title)
+        for title in (a['title'].lower() for a in articles)
+    ]
+    
+    # Candidate pairs (i < j, row-major like the old double loop) above threshold, found with one mask
+    cand_i, cand_j = np.nonzero(np.triu(sim_matrix >= threshold, k=1))
+    
+    for i, j in zip(cand_i.tolist(), cand_j.tolist()):
+        cos_sim = sim_matrix[i, j]
+        
+        # Only hard-block if titles contain CONFLICTING named entities
+        brands_i = title_brands[i]
+        brands_j = title_brands[j]
+        
+        # If both titles mention brands AND they are different brands → not duplicates
+        # OR if one has a brand and the other doesn't AND similarity is not very high
+        if brands_i and brands_j and brands_i.isdisjoint(brands_j):
+            continue
+        if (brands_i or brands_j) and not (brands_i & brands_j) and cos_sim < 0.90:
+            continue
+        
+        # Otherwise let cosine decide
+        uf.union(i, j)
     
     # Build sub-clusters
     groups = defaultdict(list)
@@ -1,32 +1,70 @@
 import logging
+import os
 import numpy as np
 from sentence_transformers import SentenceTransformer
 
 logger = logging.getLogger(__name__)
 
+# Texts per forward pass; larger batches keep the model busy instead of paying per-batch overhead
+BATCH_SIZE = 64
+
+# EMBED_BACKEND=onnx runs a dynamically INT8-quantized export of the model on ONNX Runtime
+# (needs `pip install sentence-transformers[onnx]`); EMBED_ONNX_FILE picks the file from
+# the model repo, e.g. onnx/model_qint8_arm64.onnx on ARM
+EMBED_BACKEND = os.getenv('EMBED_BACKEND', 'torch')
+EMBED_ONNX_FILE = os.getenv('EMBED_ONNX_FILE', 'onnx/model_qint8_avx512_vnni.onnx')
+
 
 class Embedder:
     """Generate SBERT embeddings for articles."""
     
     def __init__(self):
-        logger.info("Loading SBERT all-MiniLM-L6-v2 (~90MB, first run downloads model)...")
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
+        if EMBED_BACKEND == 'onnx':
+            logger.info(f"Loading SBERT all-MiniLM-L6-v2 on ONNX Runtime ({EMBED_ONNX_FILE})...")
+            self.model = SentenceTransformer(
+                'all-MiniLM-L6-v2',
+                backend='onnx',
+                model_kwargs={'file_name': EMBED_ONNX_FILE}
+            )
+        else:
+            logger.info("Loading SBERT all-MiniLM-L6-v2 (~90MB, first run downloads model)...")
+            self.model = SentenceTransformer('all-MiniLM-L6-v2')
         logger.info("SBERT model loaded successfully")
     
-    def embed(self, articles: list[dict]) -> np.ndarray:
-        """Generate embeddings for articles."""
+    @staticmethod
+    def _article_texts(articles: list[dict]) -> list[str]:
+        """Text embedded for each article: title plus the start of the content."""
         texts = []
         for a in articles:
             title = a.get('title', '')
             content = a.get('content', '')[:600]
             texts.append(f"{title}. {content}")
-        
-        embeddings = self.model.encode(
+        return texts
+    
+    def _encode(self, texts: list[str]) -> np.ndarray:
+        """Encode texts to L2-normalized embeddings."""
+        return self.model.encode(
             texts,
             normalize_embeddings=True,
-            batch_size=32,
-            show_progress_bar=False
+            batch_size=BATCH_SIZE,
+            show_progress_bar=False,
+            convert_to_numpy=True
         )
+    
+    def embed(self, articles: list[dict]) -> np.ndarray:
+        """Generate embeddings for articles."""
+        embeddings = self._encode(self._article_texts(articles))
         
         logger.info(f"[EMBED] Generated {len(embeddings)} embeddings (384-dim)")
         return embeddings
+    
+    def embed_with_prototypes(self, articles: list[dict], prototype_texts: list[str]) -> tuple[np.ndarray, np.ndarray]:
+        """Embed prototype texts and articles in one encode call.
+        
+        Returns (article_embeddings, prototype_embeddings).
+        """
+        n_protos = len(prototype_texts)
+        embeddings = self._encode(list(prototype_texts) + self._article_texts(articles))
+        
+        logger.info(f"[EMBED] Generated {len(embeddings) - n_protos} embeddings (384-dim)")
+        return embeddings[n_protos:], embeddings[:n_protos]
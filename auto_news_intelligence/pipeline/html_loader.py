@@ -2,12 +2,269 @@ import os
 import re
 import logging
 from pathlib import Path
-from hashlib import md5
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+from hashlib import blake2b
 from datetime import datetime
-from bs4 import BeautifulSoup
+from lxml import etree
 
 logger = logging.getLogger(__name__)
 
+# Inline (single-process) loading: reader threads and how many files they run ahead
+READ_THREADS = 8
+READ_AHEAD = 32
+
+# Tags whose contents are never article text
+_SKIP_TAGS = frozenset({'script', 'style', 'noscript', 'iframe'})
+
+# Class patterns for content containers (fallback steps 3 and 4)
+_CLS_ARTICLE_RE = re.compile(r'article.?(body|content|text)', re.I)
+_CLS_STORY_RE = re.compile(r'(story|post|entry).?(body|content)', re.I)
+
+# Times of India / Economic Times language-selector boilerplate
+_TOI_RE = re.compile(r'^.*?(Edition IN|हिन्दी|ગુજરાત|मराठी).*?(?=\w{20,})', re.DOTALL)
+
+# First-match <meta property=...> fields
+_META_PROPERTIES = {
+    'og:title': 'og_title',
+    'og:url': 'og_url',
+    'og:site_name': 'og_site',
+    'article:published_time': 'pubtime',
+}
+
+
+class _ArticleTarget:
+    """lxml parser target that collects article fields in one streaming pass.
+    
+    No tree is built: meta/link/time attributes, the text of the first title, h1,
+    article, itemprop=articleBody, class-matched container and main elements, and
+    all <p> texts are captured as the parser emits events. Text pieces are
+    stripped and empty ones dropped, like BeautifulSoup's get_text(strip=True).
+    """
+    
+    def __init__(self):
+        self.fields = {}
+        self.captured = {}
+        self.paragraphs = []
+        self.all_text = []
+        self._open = []  # [key, depth, pieces] for elements whose text is being captured
+        self._buffer = []
+        self._depth = 0
+        self._skip = 0
+    
+    def _capture(self, key, pieces=None):
+        self._open.append([key, self._depth, [] if pieces is None else pieces])
+    
+    def _flush(self):
+        """Emit the buffered text node (data may arrive in several chunks)."""
+        if self._buffer:
+            piece = ''.join(self._buffer).strip()
+            self._buffer.clear()
+            if piece:
+                self.all_text.append(piece)
+                for capture in self._open:
+                    capture[2].append(piece)
+    
+    def start(self, tag, attrs):
+        self._flush()
+        if self._skip or tag in _SKIP_TAGS:
+            self._skip += 1
+            return
+        self._depth += 1
+        fields = self.fields
+        
+        if tag == 'meta':
+            key = _META_PROPERTIES.get(attrs.get('property'))
+            if key and key not in fields:
+                fields[key] = attrs.get('content', '')
+            if attrs.get('name') == 'author' and 'author' not in fields:
+                fields['author'] = attrs.get('content', '')
+        elif tag == 'link':
+            if 'canonical' not in fields and 'canonical' in attrs.get('rel', '').split():
+                fields['canonical'] = attrs.get('href', '')
+        elif tag == 'time':
+            if 'time_dt' not in fields:
+                fields['time_dt'] = attrs.get('datetime', '')
+        elif tag == 'p':
+            # Reserve the slot now so nested paragraphs stay in document order
+            self.paragraphs.append(None)
+            self._capture(len(self.paragraphs) - 1)
+        
+        if tag in ('title', 'h1', 'article', 'main') and tag not in self.captured:
+            self.captured[tag] = None
+            self._capture(tag)
+        if attrs.get('itemprop') == 'articleBody' and 'itemprop' not in self.captured:
+            self.captured['itemprop'] = None
+            self._capture('itemprop')
+        cls = attrs.get('class')
+        if cls is not None:
+            cls = ' '.join(cls.split())
+            if 'article-class' not in self.captured and _CLS_ARTICLE_RE.search(cls):
+                self.captured['article-class'] = None
+                self._capture('article-class')
+            if 'story-class' not in self.captured and _CLS_STORY_RE.search(cls):
+                self.captured['story-class'] = None
+                self._capture('story-class')
+    
+    def end(self, tag):
+        self._flush()
+        if self._skip:
+            self._skip -= 1
+            return
+        open_ = self._open
+        while open_ and open_[-1][1] == self._depth:
+            key, _, pieces = open_.pop()
+            if isinstance(key, int):
+                self.paragraphs[key] = ''.join(pieces)
+            else:
+                self.captured[key] = pieces
+        self._depth -= 1
+    
+    def data(self, text):
+        if not self._skip:
+            self._buffer.append(text)
+    
+    def comment(self, text):
+        self._flush()
+    
+    def pi(self, target, data=None):
+        self._flush()
+    
+    def close(self):
+        self._flush()
+        # Elements left open by a truncated document keep what was collected
+        for key, _, pieces in self._open:
+            if isinstance(key, int):
+                self.paragraphs[key] = ''.join(pieces)
+            else:
+                self.captured[key] = pieces
+        self._open.clear()
+        return self
+
+
+def _read_bytes(path: str) -> bytes | None:
+    """File contents, or None if it can't be read (_parse_one then reports the error)."""
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _read_ahead(paths: list[str]):
+    """Yield (path, contents) in order while threads read up to READ_AHEAD files ahead."""
+    with ThreadPoolExecutor(max_workers=READ_THREADS) as pool:
+        pending = deque()
+        for path in paths:
+            pending.append((path, pool.submit(_read_bytes, path)))
+            if len(pending) > READ_AHEAD:
+                path, future = pending.popleft()
+                yield path, future.result()
+        while pending:
+            path, future = pending.popleft()
+            yield path, future.result()
+
+
+def _parse_one(path: str, html_bytes: bytes | None = None) -> tuple[dict | None, int, str]:
+    """Extract one article from an .html file (html_bytes: contents already read, if any).
+
+    Returns (article or None, log level, log message). The parent process does the
+    logging, so pool workers need no logging setup and messages stay in file order.
+    """
+    html_file = Path(path)
+    try:
+        if html_bytes is None:
+            with open(html_file, 'rb') as f:
+                html_bytes = f.read()
+        
+        # Stream the raw bytes through the target; no tree is built and no Python-side
+        # decode pass. The downloader always writes UTF-8, so the encoding is fixed
+        # rather than taken from the page's (possibly stale) <meta charset>
+        parser = etree.HTMLParser(target=_ArticleTarget(), encoding='utf-8')
+        page = etree.fromstring(html_bytes, parser)
+        fields = page.fields
+        captured = page.captured
+        
+        # Extract title
+        if fields.get('og_title'):
+            title = fields['og_title']
+        elif 'h1' in captured:
+            title = ''.join(captured['h1'])
+        elif 'title' in captured:
+            title = ''.join(captured['title'])
+        else:
+            title = html_file.stem
+        
+        # Extract URL
+        url = fields.get('og_url') or fields.get('canonical') or None
+        
+        # Extract source
+        source = fields.get('og_site') or fields.get('author') or 'Unknown'
+        
+        # Extract published_at
+        published_at = fields.get('pubtime') or fields.get('time_dt') or datetime.now().isoformat()
+        
+        # Extract content using fallback chain:
+        # 1. article tag, 2. itemprop='articleBody', 3. class matching article
+        # body/content/text, 4. class matching story/post/entry, 5. main tag
+        content = None
+        method = 'unknown'
+        for key in ('article', 'itemprop', 'article-class', 'story-class', 'main'):
+            if key in captured:
+                content = ' '.join(captured[key])
+                method = key
+                if content:
+                    break
+        
+        # 6. All <p> tags with text > 80 chars
+        if not content:
+            paragraphs = [text for text in page.paragraphs if len(text) > 80]
+            if paragraphs:
+                content = ' '.join(paragraphs)
+                method = 'paragraphs'
+        
+        # 7. Nuclear option
+        if not content:
+            content = ' '.join(page.all_text)
+            method = 'nuclear'
+        
+        # Clean content
+        original_content = content
+        content = ' '.join(content.split())
+        
+        # For Times of India and Economic Times, remove language selector boilerplate
+        if 'timesofindia' in html_file.name or 'economictimes' in html_file.name:
+            cleaned = _TOI_RE.sub('', content).strip()
+            if len(cleaned) >= 50:
+                content = cleaned
+        
+        # Cap at 5000 chars
+        content = content[:5000]
+        
+        # Skip if too short (lowered from 100 to 50)
+        if len(content) < 50:
+            return None, logging.WARNING, (f"[SKIP] {html_file.name}: {len(content)} chars after extraction "
+                                           f"(raw HTML: {len(html_bytes)} bytes) — likely JS-rendered")
+        
+        # Generate article ID
+        article_id = f"art_{blake2b(html_file.name.encode(), digest_size=4).hexdigest()}"
+        
+        article = {
+            'id': article_id,
+            'title': title,
+            'content': content,
+            'source': source,
+            'published_at': published_at,
+            'filename': html_file.name,
+            'url': url  # Add URL field
+        }
+        
+        return article, logging.INFO, f"[LOAD] {html_file.name}: {len(content)} chars (method: {method})"
+        
+    except Exception as e:
+        return None, logging.ERROR, f"[LOAD] {html_file.name}: Error - {e}"
+
 
 def load_html_articles(folder_path: str) -> list[dict]:
     """Extract clean article text from .html files."""
@@ -21,151 +278,20 @@ def load_html_articles(folder_path: str) -> list[dict]:
     html_files = list(folder.glob('*.html'))
     logger.info(f"[LOAD] Found {len(html_files)} HTML files")
     
-    for html_file in html_files:
-        try:
-            with open(html_file, 'r', encoding='utf-8', errors='ignore') as f:
-                html_content = f.read()
-            
-            soup = BeautifulSoup(html_content, 'lxml')
-            
-            # Remove unwanted tags
-            for tag in soup.find_all(['script', 'style', 'noscript', 'iframe']):
-                tag.decompose()
-            
-            # Extract title
-            title = None
-            og_title = soup.find('meta', property='og:title')
-            if og_title and og_title.get('content'):
-                title = og_title['content']
-            elif soup.find('h1'):
-                title = soup.find('h1').get_text(strip=True)
-            elif soup.find('title'):
-                title = soup.find('title').get_text(strip=True)
-            else:
-                title = html_file.stem
-            
-            # Extract URL
-            url = None
-            og_url = soup.find('meta', property='og:url')
-            if og_url and og_url.get('content'):
-                url = og_url['content']
-            else:
-                canonical = soup.find('link', rel='canonical')
-                if canonical and canonical.get('href'):
-                    url = canonical['href']
-            
-            # Extract source
-            source = 'Unknown'
-            og_site = soup.find('meta', property='og:site_name')
-            if og_site and og_site.get('content'):
-                source = og_site['content']
-            else:
-                author_meta = soup.find('meta', attrs={'name': 'author'})
-                if author_meta and author_meta.get('content'):
-                    source = author_meta['content']
-            
-            # Extract published_at
-            published_at = datetime.now().isoformat()
-            pub_time = soup.find('meta', property='article:published_time')
-            if pub_time and pub_time.get('content'):
-                published_at = pub_time['content']
-            else:
-                time_tag = soup.find('time')
-                if time_tag and time_tag.get('datetime'):
-                    published_at = time_tag['datetime']
-            
-            # Extract content using fallback chain
-            content = None
-            method = 'unknown'
-            
-            # 1. article tag
-            article_tag = soup.find('article')
-            if article_tag:
-                content = article_tag.get_text(separator=' ', strip=True)
-                method = 'article'
-            
-            # 2. itemprop='articleBody'
-            if not content:
-                article_body = soup.find(itemprop='articleBody')
-                if article_body:
-                    content = article_body.get_text(separator=' ', strip=True)
-                    method = 'itemprop'
-            
-            # 3. class matching article body/content/text
-            if not content:
-                article_class = soup.find(class_=re.compile(r'article.?(body|content|text)', re.I))
-                if article_class:
-                    content = article_class.get_text(separator=' ', strip=True)
-                    method = 'article-class'
-            
-            # 4. class matching story/post/entry
-            if not content:
-                story_class = soup.find(class_=re.compile(r'(story|post|entry).?(body|content)', re.I))
-                if story_class:
-                    content = story_class.get_text(separator=' ', strip=True)
-                    method = 'story-class'
-            
-            # 5. main tag
-            if not content:
-                main_tag = soup.find('main')
-                if main_tag:
-                    content = main_tag.get_text(separator=' ', strip=True)
-                    method = 'main'
-            
-            # 6. All <p> tags with text > 80 chars
-            if not content:
-                paragraphs = []
-                for p in soup.find_all('p'):
-                    text = p.get_text(strip=True)
-                    if len(text) > 80:
-                        paragraphs.append(text)
-                if paragraphs:
-                    content = ' '.join(paragraphs)
-                    method = 'paragraphs'
-            
-            # 7. Nuclear option
-            if not content:
-                content = soup.get_text(separator=' ', strip=True)
-                method = 'nuclear'
-            
-            # Clean content
-            original_content = content
-            content = re.sub(r'\s+', ' ', content).strip()
-            
-            # For Times of India and Economic Times, remove language selector boilerplate
-            if 'timesofindia' in html_file.name or 'economictimes' in html_file.name:
-                cleaned = re.sub(r'^.*?(Edition IN|हिन्दी|ગુજરાત|मराठी).*?(?=\w{20,})', '', content, flags=re.DOTALL).strip()
-                if len(cleaned) >= 50:
-                    content = cleaned
-            
-            # Cap at 5000 chars
-            content = content[:5000]
-            
-            # Skip if too short (lowered from 100 to 50)
-            if len(content) < 50:
-                logger.warning(f"[SKIP] {html_file.name}: {len(content)} chars after extraction "
-                             f"(raw HTML: {len(html_content)} bytes) — likely JS-rendered")
-                continue
-            
-            # Generate article ID
-            article_id = f"art_{md5(html_file.name.encode()).hexdigest()[:8]}"
-            
-            article = {
-                'id': article_id,
-                'title': title,
-                'content': content,
-                'source': source,
-                'published_at': published_at,
-                'filename': html_file.name,
-                'url': url  # Add URL field
-            }
-            
-            articles.append(article)
-            logger.info(f"[LOAD] {html_file.name}: {len(content)} chars (method: {method})")
-            
-        except Exception as e:
-            logger.error(f"[LOAD] {html_file.name}: Error - {e}")
-            continue
+    # Parse files in parallel worker processes (parsing is CPU-bound); LOAD_WORKERS=1 runs inline
+    workers = int(os.getenv('LOAD_WORKERS', max((os.cpu_count() or 2) - 1, 1)))
+    paths = [str(p) for p in html_files]
+    
+    with ProcessPoolExecutor(max_workers=workers) if workers > 1 else nullcontext() as executor:
+        if executor:
+            results = executor.map(_parse_one, paths, chunksize=8)
+        else:
+            # Parse inline while a few threads read the next files, overlapping disk waits
+            results = (_parse_one(path, html_bytes) for path, html_bytes in _read_ahead(paths))
+        for article, level, message in results:
+            logger.log(level, message)
+            if article is not None:
+                articles.append(article)
     
     logger.info(f"[LOAD] Loaded {len(articles)}/{len(html_files)} articles")
     return articles
@@ -1,11 +1,118 @@
+import asyncio
+import json
 import logging
 import os
-import time
 from collections import defaultdict
-from openai import OpenAI
+from hashlib import blake2b
+from pathlib import Path
+from openai import AsyncOpenAI
 
 logger = logging.getLogger(__name__)
 
+# Max chat completion requests in flight at once
+SUMMARIZE_CONCURRENCY = int(os.getenv('SUMMARIZE_CONCURRENCY', '8'))
+
+# Summaries from earlier runs, keyed by a hash of the sub-cluster's prompt inputs
+SUMMARY_CACHE_FILE = Path('output/summary_cache.json')
+
+SYSTEM_PROMPT = (
+    "You are an automotive industry analyst. You will receive multiple news article titles "
+    "about the same story, reported by different sources. Write a single 2-3 sentence summary "
+    "that captures the key facts of the story."
+)
+
+
+def _load_cache() -> dict:
+    """Read the summary cache; a missing or unreadable file starts an empty one."""
+    try:
+        with open(SUMMARY_CACHE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(cache: dict):
+    """Write the summary cache back to disk."""
+    SUMMARY_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(SUMMARY_CACHE_FILE, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, ensure_ascii=False)
+
+
+def _cache_key(content: str, sources: list[str], titles: list[str]) -> str:
+    """Stable key for a sub-cluster: representative content, sources (sorted) and titles."""
+    text = '\x1f'.join([content, '|'.join(sorted(sources)), '|'.join(titles)])
+    return blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+async def _summarize_one(sem: asyncio.Semaphore, client: AsyncOpenAI, cache: dict, sc_id: str, sc_articles: list[dict]) -> bool:
+    """Summarize one sub-cluster (or reuse its cached summary) and set 'summary' on its articles.
+    Returns success."""
+    # Find representative
+    rep = next((a for a in sc_articles if a.get('is_representative')), sc_articles[0])
+    
+    # Build context
+    sources = list(set(a['source'] for a in sc_articles))
+    all_titles = [a['title'] for a in sc_articles]
+    combined_content = rep.get('content', '')[:2000]
+    
+    # Build prompt
+    user_prompt = (
+        f"Story covered by {len(sources)} sources: {', '.join(sources)}\n\n"
+        f"Article titles:\n" + '\n'.join(f"- {t}" for t in all_titles) + "\n\n"
+        f"Content:\n{combined_content}\n\n"
+        f"Write a 2-3 sentence summary of this automotive news story."
+    )
+    
+    key = _cache_key(combined_content, sources, all_titles)
+    if key in cache:
+        for article in sc_articles:
+            article['summary'] = cache[key]
+        return True
+    
+    try:
+        async with sem:
+            response = await client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": user_prompt}
+                ],
+                max_tokens=180,
+                temperature=0
+            )
+        
+        summary = response.choices[0].message.content.strip()
+        cache[key] = summary
+        ok = True
+    
+    except Exception as e:
+        logger.error(f"[SUMMARIZE] Error for {sc_id}: {e}")
+        summary = "Summary unavailable"
+        ok = False
+    
+    # Apply summary to all articles in sub-cluster
+    for article in sc_articles:
+        article['summary'] = summary
+    
+    return ok
+
+
+async def _summarize_all(api_key: str, all_subclusters: dict, cache: dict) -> int:
+    """Run all sub-cluster requests with at most SUMMARIZE_CONCURRENCY in flight."""
+    sem = asyncio.Semaphore(SUMMARIZE_CONCURRENCY)
+    total = len(all_subclusters)
+    processed = 0
+    
+    async with AsyncOpenAI(api_key=api_key) as client:
+        tasks = [_summarize_one(sem, client, cache, sc_id, sc_articles) for sc_id, sc_articles in all_subclusters.items()]
+        for done in asyncio.as_completed(tasks):
+            if await done:
+                processed += 1
+                if processed % 5 == 0:
+                    logger.info(f"[SUMMARIZE] {processed}/{total} sub-clusters done")
+    
+    return processed
+
 
 def summarize_subclusters(deduped_by_cat: dict):
     """Summarize each sub-cluster using GPT-4o-mini."""
@@ -18,8 +125,6 @@ def summarize_subclusters(deduped_by_cat: dict):
                 article['summary'] = "Summary unavailable (API key not configured)"
         return
     
-    client = OpenAI(api_key=api_key)
-    
     # Group by sub_cluster_id across all categories
     all_subclusters = defaultdict(list)
     for category, articles in deduped_by_cat.items():
@@ -30,58 +135,13 @@ def summarize_subclusters(deduped_by_cat: dict):
     total_subclusters = len(all_subclusters)
     logger.info(f"[SUMMARIZE] Processing {total_subclusters} unique sub-clusters")
     
-    processed = 0
-    batch_count = 0
+    # Requests are independent; run them concurrently (the client retries rate-limit errors).
+    # Unchanged sub-clusters reuse their summary from an earlier run
+    cache = _load_cache()
+    cached_before = len(cache)
+    processed = asyncio.run(_summarize_all(api_key, all_subclusters, cache))
     
-    for sc_id, sc_articles in all_subclusters.items():
-        # Find representative
-        rep = next((a for a in sc_articles if a.get('is_representative')), sc_articles[0])
-        
-        # Build context
-        sources = list(set(a['source'] for a in sc_articles))
-        all_titles = [a['title'] for a in sc_articles]
-        combined_content = rep.get('content', '')[:2000]
-        
-        # Build prompt
-        system_prompt = (
-            "You are an automotive industry analyst. You will receive multiple news article titles "
-            "about the same story, reported by different sources. Write a single 2-3 sentence summary "
-            "that captures the key facts of the story."
-        )
-        
-        user_prompt = (
-            f"Story covered by {len(sources)} sources: {', '.join(sources)}\n\n"
-            f"Article titles:\n" + '\n'.join(f"- {t}" for t in all_titles) + "\n\n"
-            f"Content:\n{combined_content}\n\n"
-            f"Write a 2-3 sentence summary of this automotive news story."
-        )
-        
-        try:
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                max_tokens=180,
-                temperature=0
-            )
-            
-            summary = response.choices[0].message.content.strip()
-            
-            # Apply summary to all articles in sub-cluster
-            for article in sc_articles:
-                article['summary'] = summary
-            
-            processed += 1
-            
-            if processed % 5 == 0:
-                logger.info(f"[SUMMARIZE] {processed}/{total_subclusters} sub-clusters done")
-                time.sleep(1)  # Rate limiting
-        
-        except Exception as e:
-            logger.error(f"[SUMMARIZE] Error for {sc_id}: {e}")
-            for article in sc_articles:
-                article['summary'] = "Summary unavailable"
+    if len(cache) > cached_before:
+        _save_cache(cache)
     
     logger.info(f"[SUMMARIZE] Completed {processed}/{total_subclusters} sub-clusters")
@@ -1,4 +1,7 @@
 """Pipeline runner with live log streaming for Streamlit UI"""
+import codecs
+import io
+import os
 import subprocess
 import sys
 import json
@@ -6,6 +9,51 @@ import re
 from pathlib import Path
 from typing import Generator
 
+# Max bytes taken from a child's stdout per read
+READ_CHUNK = 65536
+
+# Stage labels substituted for pipeline module names in runner log lines
+STAGE_MAP = {
+    'html_loader': '[LOAD]',
+    'auto_filter': '[FILTER]',
+    'embedder': '[EMBED]',
+    'classifier': '[CLASSIFY]',
+    'deduplicator': '[DEDUP]',
+    'summarizer': '[SUMMARIZE]',
+}
+# Matches the leftmost module name, i.e. the logger name that prefixes runner log lines
+_STAGE_RE = re.compile('|'.join(map(re.escape, STAGE_MAP)))
+
+# Final stats lines printed by runner.py; each alternative captures into its own group
+_STATS_RE = re.compile(
+    r'INPUT:.*?(\d+)\s+total articles'
+    r'|AUTO FILTER:.*?(\d+)\s+automobile articles'
+    r'|STORIES:.*?(\d+)\s+unique stories'
+)
+_STATS_KEYS = {1: 'total_input', 2: 'total_automobile', 3: 'unique_stories'}
+
+
+def _iter_lines(proc: subprocess.Popen) -> Generator[str, None, None]:
+    """Yield a child's stdout line by line as output arrives.
+    
+    Each os.read returns whatever is buffered in the pipe (up to READ_CHUNK) in one
+    syscall; bytes are decoded incrementally with universal newlines and a trailing
+    partial line is held until the rest arrives.
+    """
+    decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder('utf-8')(errors='replace'), translate=True)
+    fd = proc.stdout.fileno()
+    pending = ''
+    while True:
+        chunk = os.read(fd, READ_CHUNK)
+        lines = (pending + decoder.decode(chunk, final=not chunk)).split('\n')
+        pending = lines.pop()
+        for line in lines:
+            yield line + '\n'
+        if not chunk:
+            break
+    if pending:
+        yield pending
+
 
 def stream_pipeline() -> Generator[str, None, dict]:
     """
@@ -30,11 +78,10 @@ def stream_pipeline() -> Generator[str, None, dict]:
             [sys.executable, str(download_script)],
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=1
+            bufsize=0
         )
         
-        for line in proc.stdout:
+        for line in _iter_lines(proc):
             yield f"[DOWNLOAD] {line}"
         
         proc.wait()
@@ -61,30 +108,16 @@ def stream_pipeline() -> Generator[str, None, dict]:
             [sys.executable, str(runner_script)],
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=1
+            bufsize=0
         )
         
-        # Track stage labels
-        stage_map = {
-            'html_loader': '[LOAD]',
-            'auto_filter': '[FILTER]',
-            'embedder': '[EMBED]',
-            'classifier': '[CLASSIFY]',
-            'deduplicator': '[DEDUP]',
-            'summarizer': '[SUMMARIZE]',
-        }
-        
         log_lines = []
-        for line in proc.stdout:
+        for line in _iter_lines(proc):
             log_lines.append(line)
             
             # Add stage labels based on module name
-            labeled = line
-            for module, label in stage_map.items():
-                if module in line:
-                    labeled = line.replace(module, label)
-                    break
+            match = _STAGE_RE.search(line)
+            labeled = line.replace(match.group(0), STAGE_MAP[match.group(0)]) if match else line
             
             yield labeled
         
@@ -106,7 +139,7 @@ def stream_pipeline() -> Generator[str, None, dict]:
     results_file = Path('output/results.json')
     if results_file.exists():
         try:
-            with open(results_file, 'r') as f:
+            with open(results_file, 'r', encoding='utf-8') as f:
                 data = json.load(f)
                 stats['total_input'] = data['stats']['total_input']
                 stats['total_automobile'] = data['stats']['total_automobile']
@@ -132,21 +165,8 @@ def parse_stats_from_logs(log_lines: list[str]) -> dict:
         'unique_sources': 0
     }
     
-    for line in log_lines:
-        # Look for final stats lines
-        if 'INPUT:' in line and 'total articles' in line:
-            match = re.search(r'(\d+)\s+total articles', line)
-            if match:
-                stats['total_input'] = int(match.group(1))
-        
-        if 'AUTO FILTER:' in line and 'automobile articles' in line:
-            match = re.search(r'(\d+)\s+automobile articles', line)
-            if match:
-                stats['total_automobile'] = int(match.group(1))
-        
-        if 'STORIES:' in line and 'unique stories' in line:
-            match = re.search(r'(\d+)\s+unique stories', line)
-            if match:
-                stats['unique_stories'] = int(match.group(1))
+    # One scan over the whole log; a later stats line overrides an earlier one
+    for match in _STATS_RE.finditer(''.join(log_lines)):
+        stats[_STATS_KEYS[match.lastindex]] = int(match.group(match.lastindex))
     
     return stats
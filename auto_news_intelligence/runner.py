@@ -1,5 +1,5 @@
 import logging
-import json
+import orjson
 import os
 import numpy as np
 from datetime import datetime
@@ -10,7 +10,7 @@ from itertools import count as itercount
 from pipeline.html_loader import load_html_articles
 from pipeline.auto_filter import filter_automobile_articles
 from pipeline.embedder import Embedder
-from pipeline.classifier import Classifier
+from pipeline.classifier import Classifier, CATEGORIES
 from pipeline.deduplicator import run_deduplication
 from pipeline.summarizer import summarize_subclusters
 
@@ -24,43 +24,51 @@ def build_output(deduped_by_cat, all_articles, auto_articles):
     categories_out = {}
     
     for category, articles in deduped_by_cat.items():
-        # Group by sub_cluster_id
+        # Group by sub_cluster_id, collecting each story's sources on the way
         sub_clusters = defaultdict(list)
+        sources_per_sc = defaultdict(set)
         for a in articles:
             sub_clusters[a['sub_cluster_id']].append(a)
+            sources_per_sc[a['sub_cluster_id']].add(a['source'])
         
         stories = []
         for sc_id, sc_articles in sub_clusters.items():
-            rep = next((a for a in sc_articles if a.get('is_representative')), sc_articles[0])
+            # One pass over the story's articles: representative, coherence, output rows
+            rep = None
+            coherence_sum = 0
+            articles_out = []
+            for a in sc_articles:
+                if rep is None and a.get('is_representative'):
+                    rep = a
+                coherence_sum += a.get('cluster_coherence_score', 0)
+                articles_out.append({
+                    'id': a['id'],
+                    'title': a['title'],
+                    'source': a['source'],
+                    'published_at': a.get('published_at', ''),
+                    'is_representative': a.get('is_representative', False),
+                    'content_preview': a.get('content', '')[:200],
+                    'auto_score': a.get('auto_score', 0),
+                    'category_confidence': a.get('category_confidence', 0),
+                    'url': a.get('url', None),
+                    'cluster_reason': a.get('cluster_reason', ''),  # NEW - Task 5
+                    'duplicate_reason': a.get('duplicate_reason', ''),  # NEW - Task 4
+                    'cluster_coherence_score': a.get('cluster_coherence_score', 0),  # NEW - Task 4
+                })
+            if rep is None:
+                rep = sc_articles[0]
             
-            # Compute average cluster coherence for this story
-            coherence_scores = [a.get('cluster_coherence_score', 0) for a in sc_articles]
-            avg_coherence = sum(coherence_scores) / len(coherence_scores) if coherence_scores else 0
+            # Average cluster coherence for this story
+            avg_coherence = coherence_sum / len(sc_articles) if sc_articles else 0
             
             stories.append({
                 'sub_cluster_id': sc_id,
                 'story_count': len(sc_articles),
                 'summary': rep.get('summary', rep.get('content', '')[:200] + '...'),  # Use content preview if no summary
                 'representative_title': rep['title'],
-                'sources': list(set(a['source'] for a in sc_articles)),
+                'sources': list(sources_per_sc[sc_id]),
                 'cluster_coherence_score': avg_coherence,  # NEW
-                'articles': [
-                    {
-                        'id': a['id'],
-                        'title': a['title'],
-                        'source': a['source'],
-                        'published_at': a.get('published_at', ''),
-                        'is_representative': a.get('is_representative', False),
-                        'content_preview': a.get('content', '')[:200],
-                        'auto_score': a.get('auto_score', 0),
-                        'category_confidence': a.get('category_confidence', 0),
-                        'url': a.get('url', None),
-                        'cluster_reason': a.get('cluster_reason', ''),  # NEW - Task 5
-                        'duplicate_reason': a.get('duplicate_reason', ''),  # NEW - Task 4
-                        'cluster_coherence_score': a.get('cluster_coherence_score', 0),  # NEW - Task 4
-                    }
-                    for a in sc_articles
-                ]
+                'articles': articles_out
             })
         
         # Sort stories by story_count desc (most covered first)
@@ -111,36 +119,46 @@ def run():
         logger.error("No automobile articles found after filtering.")
         return
     
-    # 3. Generate SBERT embeddings
+    # 3. Generate SBERT embeddings (category prototypes encoded in the same call)
     embedder = Embedder()
-    embeddings = embedder.embed(auto_articles)
+    embeddings, prototypes = embedder.embed_with_prototypes(auto_articles, list(CATEGORIES.values()))
     
     # 4. Classify into 8 categories
-    classifier = Classifier(embedder)
+    classifier = Classifier(embedder, prototypes=prototypes)
     auto_articles = classifier.classify(auto_articles, embeddings)
     
     # 5. Confidence gate - Remove false positives with low confidence
     MIN_CONFIDENCE = float(os.getenv('MIN_CATEGORY_CONFIDENCE', '0.14'))
     before_gate = len(auto_articles)
-    auto_articles = [a for a in auto_articles if a.get('category_confidence', 0) >= MIN_CONFIDENCE]
+    keep_mask = np.array([a.get('category_confidence', 0) >= MIN_CONFIDENCE for a in auto_articles], dtype=bool)
+    auto_articles = [a for a, keep in zip(auto_articles, keep_mask) if keep]
     conf_removed = before_gate - len(auto_articles)
     if conf_removed > 0:
         logger.info(f"[CONFIDENCE GATE] Removed {conf_removed} articles with category_confidence < {MIN_CONFIDENCE}")
     
-    # Re-generate embeddings for filtered articles
-    embeddings = embedder.embed(auto_articles)
+    # Keep the embedding rows of the surviving articles (same texts, so no re-encode)
+    embeddings = embeddings[keep_mask]
     
     # 6. Group by category
     articles_by_cat = defaultdict(list)
-    embeddings_by_cat = defaultdict(list)
+    rows_by_cat = defaultdict(list)
     for i, article in enumerate(auto_articles):
         cat = article['category']
         articles_by_cat[cat].append(article)
-        embeddings_by_cat[cat].append(embeddings[i])
-    
-    # Convert embedding lists to numpy arrays
-    for cat in embeddings_by_cat:
-        embeddings_by_cat[cat] = np.array(embeddings_by_cat[cat])
+        rows_by_cat[cat].append(i)
+    
+    # One contiguous float32 matrix with each category's rows adjacent; per-category
+    # embeddings are slice views into it (no per-row copies). Dedup computes each
+    # category's similarity block X[sl] @ X[sl].T straight from these views; a single
+    # X @ X.T would also build the cross-category blocks, which dedup never reads
+    order = [i for rows in rows_by_cat.values() for i in rows]
+    all_embeddings = np.ascontiguousarray(np.asarray(embeddings)[order], dtype=np.float32)
+    cat_slices = {}
+    start = 0
+    for cat, rows in rows_by_cat.items():
+        cat_slices[cat] = slice(start, start + len(rows))
+        start += len(rows)
+    embeddings_by_cat = {cat: all_embeddings[sl] for cat, sl in cat_slices.items()}
     
     # 7. Deduplicate within each category with global counter
     threshold = float(os.getenv('SIMILARITY_THRESHOLD', '0.72'))
@@ -156,8 +174,8 @@ def run():
     
     # 10. Save
     os.makedirs('output', exist_ok=True)
-    with open('output/results.json', 'w') as f:
-        json.dump(output, f, indent=2, default=str)
+    with open('output/results.json', 'wb') as f:
+        f.write(orjson.dumps(output, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY, default=str))
     
     # 11. Print stats with gate summary
     final_count = len(auto_articles)
@@ -3,11 +3,15 @@ import logging
 import re
 from pathlib import Path
 from datetime import datetime
+from typing import Iterable
 
 logger = logging.getLogger(__name__)
 
 MASTER_FILE = Path('url_batches/all_links.txt')
 
+# http/https URL up to the next whitespace
+_URL_RE = re.compile(r'https?://\S+')
+
 
 def load_master_urls() -> set[str]:
     """Load existing URLs from master file."""
@@ -24,24 +28,20 @@ def load_master_urls() -> set[str]:
 
 def parse_urls_from_text(text: str) -> list[str]:
     """Extract valid HTTP/HTTPS URLs from text, one per line."""
-    lines = text.strip().split('\n')
+    return parse_urls_from_lines(text.strip().split('\n'))
+
+
+def parse_urls_from_lines(lines: Iterable[str]) -> list[str]:
+    """Extract valid HTTP/HTTPS URLs from an iterable of lines (e.g. an open file)."""
     urls = []
     
-    # Regex for http/https URLs
-    url_pattern = re.compile(r'https?://[^\s]+')
-    
     for line in lines:
         line = line.strip()
         if not line:
             continue
         
-        # Try direct match first (most common case)
-        if line.startswith('http://') or line.startswith('https://'):
-            urls.append(line)
-        else:
-            # Extract URLs from line
-            matches = url_pattern.findall(line)
-            urls.extend(matches)
+        # findall covers both a bare URL line and URLs embedded in text
+        urls.extend(_URL_RE.findall(line))
     
     logger.info(f"Parsed {len(urls)} URLs from input text")
     return urls
@@ -56,18 +56,17 @@ def append_new_urls(new_urls: list[str]) -> tuple[int, int]:
     """
     existing = load_master_urls()
     
-    # Deduplicate
-    to_add = [url for url in new_urls if url not in existing]
+    # Deduplicate against the master file and within the batch (first occurrence kept)
+    to_add = [url for url in dict.fromkeys(new_urls) if url not in existing]
     skipped = len(new_urls) - len(to_add)
     
     if not to_add:
         logger.info(f"No new URLs to add (all {len(new_urls)} already exist)")
         return 0, skipped
     
-    # Append to file
+    # Append to file in a single write
     with open(MASTER_FILE, 'a', encoding='utf-8') as f:
-        for url in to_add:
-            f.write(f"{url}\n")
+        f.write('\n'.join(to_add) + '\n')
     
     timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     logger.info(f"[{timestamp}] Appended {len(to_add)} new URLs to {MASTER_FILE} (skipped {skipped} duplicates)")